@@ -0,0 +1,152 @@
+import math
+import pygame
+from setup.config import WIDTH, HEIGHT, TILE_WIDTH, TILE_HEIGHT
+
+WALL_COLOR = 'blue'
+PI = math.pi
+HUD_RECT = pygame.Rect(0, HEIGHT - 50, WIDTH, 50)
+
+
+def draw_walls_original(surface, level):
+    """Draw the classic-style walls and gate of the original level"""
+    num1 = TILE_HEIGHT
+    num2 = TILE_WIDTH
+
+    for i in range(len(level)):
+        for j in range(len(level[i])):
+            tile = level[i][j]
+
+            if tile == 3:  # Vertical
+                pygame.draw.line(surface, WALL_COLOR, (j * num2 + num2 // 2, i * num1),
+                                 (j * num2 + num2 // 2, i * num1 + num1), 3)
+            elif tile == 4:  # Horizontal
+                pygame.draw.line(surface, WALL_COLOR, (j * num2, i * num1 + num1 // 2),
+                                 (j * num2 + num2, i * num1 + num1 // 2), 3)
+            elif tile == 5:  # Top-right corner
+                pygame.draw.arc(surface, WALL_COLOR,
+                                [(j * num2 - (num2 * 0.4)) - 2, (i * num1 + (0.5 * num1)), num2, num1],
+                                0, PI / 2, 3)
+            elif tile == 6:  # Top-left corner
+                pygame.draw.arc(surface, WALL_COLOR,
+                                [(j * num2 + (num2 * 0.5)), (i * num1 + (0.5 * num1)), num2, num1],
+                                PI / 2, PI, 3)
+            elif tile == 7:  # Bottom-left corner
+                pygame.draw.arc(surface, WALL_COLOR,
+                                [(j * num2 + (num2 * 0.5)), (i * num1 - (0.4 * num1)), num2, num1],
+                                PI, 3 * PI / 2, 3)
+            elif tile == 8:  # Bottom-right corner
+                pygame.draw.arc(surface, WALL_COLOR,
+                                [(j * num2 - (num2 * 0.4)) - 2, (i * num1 - (0.4 * num1)), num2, num1],
+                                3 * PI / 2, 2 * PI, 3)
+            elif tile == 9:  # Gate
+                pygame.draw.line(surface, 'white',
+                                 (j * num2 + 5, i * num1 + num1 // 2),
+                                 (j * num2 + num2 - 5, i * num1 + num1 // 2), 2)
+
+
+def draw_walls_generated(surface, level):
+    """Draw the generated maze walls as solid blue blocks"""
+    for i in range(len(level)):
+        for j in range(len(level[i])):
+            if level[i][j] == 4:
+                x = j * TILE_WIDTH
+                y = i * TILE_HEIGHT
+                # Outer darker border
+                pygame.draw.rect(surface, (0, 0, 180), pygame.Rect(x, y, TILE_WIDTH, TILE_HEIGHT))
+                # Inner brighter fill
+                pygame.draw.rect(surface, (0, 0, 255), pygame.Rect(x + 2, y + 2, TILE_WIDTH - 4, TILE_HEIGHT - 4))
+
+
+class BoardRenderer:
+    """
+    Draws the board from cached layers and tracks which screen areas changed.
+
+    Walls are baked once per level into an opaque background Surface. Regular pellets
+    from the level's PelletIndex live on a transparent layer that is cleared tile by
+    tile as they are eaten. Power pellets flicker, so they are redrawn every frame on
+    top of the layers, straight from the index.
+
+    Each frame: begin_frame() repaints the areas that last frame's sprites covered,
+    sprites are drawn and reported through add_dirty(), and end_frame() returns the
+    rectangles to pass to pygame.display.update().
+    """
+
+    def __init__(self, level, level_source, pellet_index):
+        self.level_source = level_source
+        self.pellet_index = pellet_index
+        if level_source == 'original':
+            self.pellet_radius, self.power_radius = 4, 10
+        else:
+            self.pellet_radius, self.power_radius = 3, 8
+
+        self.background = pygame.Surface((WIDTH, HEIGHT))
+        self.background.fill('black')
+        if level_source == 'original':
+            draw_walls_original(self.background, level)
+        else:
+            draw_walls_generated(self.background, level)
+
+        self.pellet_layer = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        for x, y in pellet_index.pellets:
+            pygame.draw.circle(self.pellet_layer, 'white', self.tile_center(x, y), self.pellet_radius)
+
+        self.full_redraw = True
+        self.previous_rects = []  # Drawn over last frame, repainted this frame
+        self.dirty_rects = []
+
+    @staticmethod
+    def tile_rect(x, y):
+        return pygame.Rect(x * TILE_WIDTH, y * TILE_HEIGHT, TILE_WIDTH, TILE_HEIGHT)
+
+    @staticmethod
+    def tile_center(x, y):
+        return (x * TILE_WIDTH + TILE_WIDTH // 2, y * TILE_HEIGHT + TILE_HEIGHT // 2)
+
+    def erase_pellet(self, x, y):
+        """Clear an eaten pellet's tile from the pellet layer"""
+        rect = self.tile_rect(x, y)
+        self.pellet_layer.fill((0, 0, 0, 0), rect)
+        self.previous_rects.append(rect)
+
+    def restore(self, screen, rect):
+        """Repaint an area of the screen from the background and pellet layers"""
+        screen.blit(self.background, rect, rect)
+        screen.blit(self.pellet_layer, rect, rect)
+
+    def request_full_redraw(self):
+        self.full_redraw = True
+
+    def begin_frame(self, screen, flicker):
+        """Repaint last frame's sprite areas, the HUD strip and the power pellets"""
+        if self.full_redraw:
+            screen.blit(self.background, (0, 0))
+            screen.blit(self.pellet_layer, (0, 0))
+            self.dirty_rects = [screen.get_rect()]
+            self.full_redraw = False
+        else:
+            for rect in self.previous_rects:
+                self.restore(screen, rect)
+            self.dirty_rects = list(self.previous_rects)
+
+        self.previous_rects = []
+
+        # Repainted every frame anyway, so they are not carried over to the next one
+        self.restore(screen, HUD_RECT)
+        self.dirty_rects.append(HUD_RECT)
+
+        for x, y in self.pellet_index.power_pellets:
+            rect = self.tile_rect(x, y)
+            self.restore(screen, rect)
+            if not flicker:
+                pygame.draw.circle(screen, 'white', self.tile_center(x, y), self.power_radius)
+            self.dirty_rects.append(rect)
+
+    def add_dirty(self, rect):
+        """Report an area drawn over this frame; it is repainted from the layers next frame"""
+        rect = pygame.Rect(rect)
+        self.dirty_rects.append(rect)
+        self.previous_rects.append(rect)
+
+    def end_frame(self):
+        """Rectangles of the screen that changed this frame"""
+        return self.dirty_rects
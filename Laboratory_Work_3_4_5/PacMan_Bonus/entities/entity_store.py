@@ -0,0 +1,257 @@
+import numpy as np
+from setup.config import WIDTH, HEIGHT
+
+# Entity kinds
+PLAYER = 0
+GHOST = 1
+
+# State flags (bit field)
+ACTIVE = 1
+FRIGHTENED = 2
+EATEN = 4  # Ghost returning to the box (is_returning_to_box)
+IN_BOX = 8  # Ghost inside the ghost box, as of the last ghost_turns()
+EXIT_READY = 16  # Ghost's box timer has reached its exit timer
+
+# Movement per direction: 0 right, 1 left, 2 up, 3 down
+DX = np.array([1, -1, 0, 0], dtype=np.float64)
+DY = np.array([0, 0, -1, 1], dtype=np.float64)
+
+# Offset from the sprite's top-left corner to its centre, per kind: the player's from
+# pacman.py, the ghosts' the one BaseGhost.move leaves them at after every step
+CENTER_DX = np.array([23, 15], dtype=np.float64)
+CENTER_DY = np.array([24, 14], dtype=np.float64)
+
+STUCK_FRAMES = 180  # Frames a ghost may try to leave the box before only up is allowed
+
+
+class EntityStore:
+    """
+    Positions, directions, speeds, kinds and state flags of many actors kept in NumPy
+    arrays (one row per entity), so movement and turn validation run for all of them
+    in a single vectorized call instead of one method call per object.
+
+    Player rows turn by the same tile probes as Player.get_turns and ghost rows by the
+    rules of BaseGhost.check_valid_directions (box, gate, stuck counter, screen edges).
+    step() does what process_movement does for the player: move along the current
+    direction if it is open, then take the queued command if that turn is allowed.
+    """
+
+    def __init__(self, level, capacity=8, level_info=None):
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.direction = np.zeros(capacity, dtype=np.int8)
+        self.command = np.zeros(capacity, dtype=np.int8)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+        self.stuck = np.zeros(capacity, dtype=np.int32)  # Ghosts' timeout_counter
+        self.set_level(level, level_info)
+
+    def set_level(self, level, level_info=None):
+        """
+        Cache the walkable grid (tiles below 3) used for turn validation, and the gate
+        and box of level_info (a LevelInfo), which ghosts only use on the original level
+        """
+        self.walkable = np.array([[tile < 3 for tile in row] for row in level], dtype=bool)
+        self.rows, self.cols = self.walkable.shape
+        self.original = level_info is not None and level_info.level_source == 'original'
+        self.gate = level_info.gate if self.original else None
+        self.box = level_info.box if self.original else None
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        capacity = max(1, len(self.x) * 2)
+        for name in ('x', 'y', 'kind', 'direction', 'command', 'speed', 'flags', 'stuck'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add(self, x, y, speed, direction=0, kind=PLAYER, flags=ACTIVE):
+        """Append an entity and return its index"""
+        if self.count == len(self.x):
+            self._grow()
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.kind[i] = kind
+        self.direction[i] = direction
+        self.command[i] = direction
+        self.speed[i] = speed
+        self.flags[i] = flags
+        self.stuck[i] = 0
+        self.count += 1
+        return i
+
+    @classmethod
+    def from_players(cls, level, players):
+        """Build a store holding the current state of Player objects"""
+        return cls.from_actors(level, players=players)
+
+    @classmethod
+    def from_actors(cls, level, players=(), ghosts=(), level_info=None):
+        """
+        Build a store holding the current state of Player and BaseGhost objects, players
+        first. level_info defaults to the first ghost's.
+        """
+        players, ghosts = list(players), list(ghosts)
+        if level_info is None and ghosts:
+            level_info = ghosts[0].get_level_info()
+        store = cls(level, capacity=max(1, len(players) + len(ghosts)), level_info=level_info)
+        for player in players:
+            i = store.add(player.x, player.y, player.speed, player.direction)
+            store.command[i] = player.command
+        for ghost in ghosts:
+            flags = ACTIVE
+            if ghost.powerup() and not ghost.eaten_ghost()[ghost.id]:
+                flags |= FRIGHTENED
+            if ghost.is_returning_to_box:
+                flags |= EATEN
+            if ghost.in_box:
+                flags |= IN_BOX
+            if ghost.box_timer >= ghost.exit_timer:
+                flags |= EXIT_READY
+            i = store.add(ghost.x_pos, ghost.y_pos, ghost.speed, ghost.direction, GHOST, flags)
+            store.stuck[i] = ghost.timeout_counter
+        return store
+
+    def centers(self):
+        """Centre x and y arrays of all entities"""
+        n = self.count
+        kind = self.kind[:n]
+        return self.x[:n] + CENTER_DX[kind], self.y[:n] + CENTER_DY[kind]
+
+    def tiles(self):
+        """Tile column and row of every entity's centre"""
+        cx, cy = self.centers()
+        num1 = (HEIGHT - 50) // 32
+        num2 = WIDTH // 30
+        return (cx // num2).astype(np.intp), (cy // num1).astype(np.intp)
+
+    def _open(self, rows, cols):
+        rows = np.clip(rows.astype(np.intp), 0, self.rows - 1)
+        cols = np.clip(cols.astype(np.intp), 0, self.cols - 1)
+        return self.walkable[rows, cols]
+
+    def valid_turns(self):
+        """(count, 4) bool array of allowed directions: right, left, up, down"""
+        turns = self.player_turns()
+        ghosts = self.kind[:self.count] == GHOST
+        if ghosts.any():
+            turns[ghosts] = self.ghost_turns()[ghosts]
+        return turns
+
+    def player_turns(self):
+        """Allowed directions of every row by the rules of Player.get_turns"""
+        num1 = (HEIGHT - 50) // 32
+        num2 = WIDTH // 30
+        num3 = 15
+        cx, cy = self.centers()
+        col = cx // num2
+        row = cy // num1
+
+        turns = np.empty((self.count, 4), dtype=bool)
+        turns[:, 0] = self._open(row, (cx + num3) // num2)
+        turns[:, 1] = self._open(row, (cx - num3) // num2)
+        turns[:, 2] = self._open((cy - num3) // num1, col)
+        turns[:, 3] = self._open((cy + num3) // num1, col)
+
+        # Moving vertically near a tile's middle row: look a whole tile to the sides
+        vertical = (self.direction[:self.count] >= 2) & (cy % num1 >= 12) & (cy % num1 <= 18)
+        turns[:, 0] |= vertical & self._open(row, (cx + num2) // num2)
+        turns[:, 1] |= vertical & self._open(row, (cx - num2) // num2)
+
+        # Outside the inner columns only horizontal movement (the tunnel) is allowed
+        outside = (col <= 0) | (col >= self.cols - 1)
+        turns[outside] = (True, True, False, False)
+        return turns
+
+    def ghost_turns(self):
+        """
+        Allowed directions of every row by the rules of BaseGhost.check_valid_directions.
+        Like that method it counts stuck frames and updates IN_BOX; call it once per
+        frame, and only rely on the rows of ghosts.
+        """
+        n = self.count
+        num1 = (HEIGHT - 50) // 32
+        num2 = WIDTH // 30
+        cx, cy = self.centers()
+        col = (cx // num2).astype(np.intp)
+        row = (cy // num1).astype(np.intp)
+        flags = self.flags[:n]
+        ghosts = self.kind[:n] == GHOST
+
+        in_box = np.zeros(n, dtype=bool)
+        if self.original:
+            box = self.box
+            x, y = self.x[:n], self.y[:n]
+            in_box = (box['left'] < x) & (x < box['right']) & (box['top'] < y) & (y < box['bottom'])
+
+        # Trying to leave the box: count the frames, and after too many only allow up
+        leaving = ghosts & in_box & ((flags & EXIT_READY) != 0)
+        self.stuck[:n] += leaving
+        forced = leaving & (self.stuck[:n] > STUCK_FRAMES)
+
+        # Neighbours off the board stay closed; the centre tile must be on it
+        inside = (row >= 0) & (row < self.rows) & (col >= 0) & (col < self.cols)
+        turns = np.empty((n, 4), dtype=bool)
+        turns[:, 0] = inside & (col + 1 < self.cols) & self._open(row, col + 1)
+        turns[:, 1] = inside & (col - 1 >= 0) & self._open(row, col - 1)
+        turns[:, 2] = inside & (row - 1 >= 0) & self._open(row - 1, col)
+        turns[:, 3] = inside & (row + 1 < self.rows) & self._open(row + 1, col)
+
+        # In the box up is always open; out of it, the gate lets eaten ghosts back in
+        turns[:, 2] |= inside & in_box
+        if self.gate is not None:
+            gate_x, gate_y = self.gate
+            aligned = np.abs(cx - (gate_x * num2 + num2 // 2)) < 20
+            turns[:, 3] |= inside & aligned & ((flags & EATEN) != 0) & (row == gate_y - 1)
+
+        # Screen edges, for the tunnel
+        turns[:, 1] |= cx < 20
+        turns[:, 0] |= cx > WIDTH - 20
+
+        turns[forced] = (False, False, True, False)
+        self.flags[:n] = np.where(ghosts & in_box, flags | IN_BOX, flags & ~np.uint8(IN_BOX))
+        return turns
+
+    def step(self, turns=None):
+        """
+        Advance every active entity one frame: move if its direction is open, then
+        switch to its command if that turn is allowed. Returns the turns used.
+        """
+        n = self.count
+        if turns is None:
+            turns = self.valid_turns()
+        index = np.arange(n)
+        direction = self.direction[:n].astype(np.intp)
+        active = (self.flags[:n] & ACTIVE) != 0
+
+        moving = active & turns[index, direction]
+        distance = np.where(moving, self.speed[:n], 0.0)
+        self.x[:n] += DX[direction] * distance
+        self.y[:n] += DY[direction] * distance
+
+        command = self.command[:n].astype(np.intp)
+        turning = active & turns[index, command]
+        self.direction[:n] = np.where(turning, command, direction)
+        return turns
+
+    def wrap(self):
+        """Screen wraparound through the tunnel, as handle_screen_wraparound does for the player"""
+        n = self.count
+        self.x[:n] = np.where(self.x[:n] > 900, -47, self.x[:n])
+        self.x[:n] = np.where(self.x[:n] < -50, 897, self.x[:n])
+
+    def set_flag(self, index, flag, value=True):
+        if value:
+            self.flags[index] |= flag
+        else:
+            self.flags[index] &= ~np.uint8(flag)
+
+    def has_flag(self, flag):
+        """Bool array of the entities that have a flag set"""
+        return (self.flags[:self.count] & flag) != 0
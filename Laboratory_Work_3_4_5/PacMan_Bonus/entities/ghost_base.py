@@ -1,36 +1,29 @@
 import pygame
 from maze_solver.pathfinding_utils import bfs_path, dfs_path, dijkstra_path
+from maze_solver.level_graph import LevelGraph
 from setup.config import WIDTH, HEIGHT, TILE_WIDTH, TILE_HEIGHT
+from setup.level_info import LevelInfo
 from entities.player import Player
+from entities.sprite_atlas import SpriteAtlas
 import random
 import math
 
 def is_walkable(level, x, y):
     return level[y][x] == 1
 
-def convert_level_to_bitmask_maze(level):
-    rows, cols = len(level), len(level[0])
-    bitmask_maze = [[0 for _ in range(cols)] for _ in range(rows)]
 
-    for y in range(rows):
-        for x in range(cols):
-            if level[y][x] <= 2:
-                if y > 0 and level[y - 1][x] <= 2:
-                    bitmask_maze[y][x] |= 1  # N
-                if y < rows - 1 and level[y + 1][x] <= 2:
-                    bitmask_maze[y][x] |= 2  # S
-                if x < cols - 1 and level[y][x + 1] <= 2:
-                    bitmask_maze[y][x] |= 4  # E
-                if x > 0 and level[y][x - 1] <= 2:
-                    bitmask_maze[y][x] |= 8  # W
-    return bitmask_maze
+def approach(value, target, step):
+    """Move value towards target by at most step"""
+    if abs(target - value) <= step:
+        return target
+    return value + step if target > value else value - step
 
 
 class BaseGhost:
     """Base ghost class with unified movement and state handling"""
 
     def __init__(self, x, y, speed, img, direction, ghost_id, level, screen,
-                 powerup_ref, eaten_ghost_ref, level_source_ref, ghost_movement_ref):
+                 powerup_ref, eaten_ghost_ref, level_source_ref, ghost_movement_ref, sprites=None):
         self.x_pos = x
         self.y_pos = y
         self.center_x = self.x_pos + TILE_WIDTH // 2
@@ -51,6 +44,8 @@ class BaseGhost:
 
         # Pathfinding attributes
         self.path_algorithm = None  # Set externally (e.g., initialize_game)
+        self.level_graph = None  # Shared LevelGraph, set externally (e.g., initialize_game)
+        self.level_info = None  # Shared LevelInfo, set externally (e.g., initialize_game)
         self.path = []
         self.path_step = 1
 
@@ -67,31 +62,34 @@ class BaseGhost:
         self.force_exit = False
         self.timeout_counter = 0
 
-        self.powerup_img = pygame.transform.scale(pygame.image.load('assets/ghost_images/powerup.png'), (45, 45))
-        self.dead_img = pygame.transform.scale(pygame.image.load('assets/ghost_images/dead.png'), (45, 45))
-
-        self.box_coords = {
-            'left': 380,
-            'right': 500,
-            'top': 370,
-            'bottom': 480,
-            'entry_x': 440,
-            'entry_y': 370
-        }
+        # Normal/powerup/dead images; pass a shared atlas to avoid loading them per ghost
+        if sprites is None:
+            sprites = SpriteAtlas.for_ghost(
+                img,
+                pygame.transform.scale(pygame.image.load('assets/ghost_images/powerup.png'), (45, 45)),
+                pygame.transform.scale(pygame.image.load('assets/ghost_images/dead.png'), (45, 45)))
+        self.sprites = sprites
 
         if self.level_source() == 'original':
             self.in_box = self.id != 0
         else:
             self.in_box = False
 
+    def get_level_info(self):
+        """Shared level landmarks, built on first use if initialize_game did not set them"""
+        if self.level_info is None:
+            self.level_info = LevelInfo(self.level, self.level_source())
+        return self.level_info
+
     def is_in_box(self):
         """Check if ghost is in the ghost box based on coordinates"""
         # Only applicable for original level
         if self.level_source() != 'original':
             return False
 
-        return (self.box_coords['left'] < self.x_pos < self.box_coords['right'] and
-                self.box_coords['top'] < self.y_pos < self.box_coords['bottom'])
+        box = self.get_level_info().box
+        return (box['left'] < self.x_pos < box['right'] and
+                box['top'] < self.y_pos < box['bottom'])
 
     def check_valid_directions(self):
         """
@@ -147,18 +145,10 @@ class BaseGhost:
 
             # Special case: Gate handling (only for original level)
             if self.level_source() == 'original':
-                # Look for the gate (value 9) in the level
-                gate_found = False
-                gate_x, gate_y = 0, 0
-
-                for y in range(len(self.level)):
-                    for x in range(len(self.level[0])):
-                        if self.level[y][x] == 9:
-                            gate_x, gate_y = x, y
-                            gate_found = True
-                            break
-                    if gate_found:
-                        break
+                # Gate (value 9) position, found once per level
+                gate = self.get_level_info().gate
+                gate_found = gate is not None
+                gate_x, gate_y = gate if gate_found else (0, 0)
 
                 # If we found the gate, check if we're right below it and trying to exit
                 if gate_found and in_box and self.box_timer >= self.exit_timer:
@@ -208,21 +198,9 @@ class BaseGhost:
             return True
 
         # Time to exit - first, move to gate x-position
-        gate_x = 440  # Default gate x-position
-
-        # Look for the actual gate in the level
-        gate_found = False
-        num1 = (HEIGHT - 50) // 32
-        num2 = WIDTH // 30
-
-        for y in range(len(self.level)):
-            for x in range(len(self.level[0])):
-                if self.level[y][x] == 9:
-                    gate_x = x * num2 + num2 // 2
-                    gate_found = True
-                    break
-            if gate_found:
-                break
+        gate_x = self.get_level_info().gate_center_x()
+        if gate_x is None:
+            gate_x = 440  # Default gate x-position
 
         # Stage 1: Align horizontally with gate
         if abs(self.center_x - gate_x) > 10:
@@ -239,7 +217,7 @@ class BaseGhost:
             self.y_pos -= self.speed
 
             # Check if we've made it out
-            if self.y_pos < self.box_coords['top'] - 5:
+            if self.y_pos < self.get_level_info().box['top'] - 5:
                 self.in_box = False
                 self.box_timer = 0
                 self.timeout_counter = 0
@@ -257,25 +235,11 @@ class BaseGhost:
 
         # Generated levels have no box - just respawn ghost at center
         if self.level_source() != 'original':
-            # Find a random valid path position
-            valid_paths = []
+            # Path positions near the center, found once per level
+            valid_paths = self.get_level_info().respawn_positions
             center_x = WIDTH // 2
             center_y = HEIGHT // 2
 
-            # Find center area paths
-            num1 = (HEIGHT - 50) // 32
-            num2 = WIDTH // 30
-
-            for y, row in enumerate(self.level):
-                for x, cell in enumerate(row):
-                    if cell == 1 or cell == 0:  # Path or empty space
-                        screen_x = x * num2
-                        screen_y = y * num1
-                        # If near center
-                        if (abs(screen_x - center_x) < 100 and
-                                abs(screen_y - center_y) < 100):
-                            valid_paths.append((screen_x, screen_y))
-
             # Pick a random position near center
             if valid_paths:
                 pos = random.choice(valid_paths)
@@ -292,28 +256,18 @@ class BaseGhost:
             return False
 
         # Original level - return to actual ghost box
-        # Look for the gate position
-        gate_pos = None
-        num1 = (HEIGHT - 50) // 32
-        num2 = WIDTH // 30
-
-        # Find the gate by checking the level
-        for y in range(len(self.level)):
-            for x in range(len(self.level[0])):
-                if self.level[y][x] == 9:  # Gate tile
-                    gate_pos = (x * num2 + num2 // 2, y * num1)
-                    break
-            if gate_pos:
-                break
-
-        # If no gate found, use center top of box
-        if not gate_pos:
-            gate_pos = (WIDTH // 2, self.box_coords['top'])
+        info = self.get_level_info()
+        box = info.box
+        if info.gate is not None:
+            gate_pos = (info.gate_center_x(), info.gate_top())
+        else:
+            # If no gate found, use center top of box
+            gate_pos = (WIDTH // 2, box['top'])
 
         # Get the box center for final positioning
         box_center = (
-            (self.box_coords['left'] + self.box_coords['right']) // 2,
-            (self.box_coords['top'] + self.box_coords['bottom']) // 2
+            (box['left'] + box['right']) // 2,
+            (box['top'] + box['bottom']) // 2
         )
 
         # Already in box?
@@ -329,6 +283,13 @@ class BaseGhost:
             self.center_y = self.y_pos + 22
             return True
 
+        # Follow the flow field home at double speed, around the walls
+        if info.home_flow is not None and self.follow_flow(info.home_flow, self.speed * 2):
+            self.center_x = self.x_pos + 22
+            self.center_y = self.y_pos + 22
+            return True
+
+        # Fallback when off the flow field (e.g. in the tunnel): straight lines to the gate
         # Phase 1: Move to the gate x-position
         if abs(self.center_x - gate_pos[0]) > 10:
             if self.center_x < gate_pos[0]:
@@ -365,6 +326,42 @@ class BaseGhost:
         self.center_y = self.y_pos + 22
         return True
 
+    def follow_flow(self, flow, step):
+        """
+        Move one frame along a FlowField, keeping to the middle of the tiles so no wall
+        corner is cut. Returns False if the ghost's tile has no flow data.
+        """
+        cx, cy = self.x_pos + 22, self.y_pos + 22
+        tile_x, tile_y = int(cx // TILE_WIDTH), int(cy // TILE_HEIGHT)
+        direction = flow.direction(tile_x, tile_y)
+        if direction is None and (tile_x, tile_y) not in flow.goals:
+            return False
+
+        mid_x = tile_x * TILE_WIDTH + TILE_WIDTH // 2
+        mid_y = tile_y * TILE_HEIGHT + TILE_HEIGHT // 2
+        if direction is None:  # On the goal tile: settle on its middle
+            new_x, new_y = approach(cx, mid_x, step), approach(cy, mid_y, step)
+        elif direction < 2 and cy != mid_y:  # Line up with the row before moving sideways
+            new_x, new_y = cx, approach(cy, mid_y, step)
+        elif direction >= 2 and cx != mid_x:  # Line up with the column before moving vertically
+            new_x, new_y = approach(cx, mid_x, step), cy
+        else:
+            new_x = cx + (step if direction == 0 else -step if direction == 1 else 0)
+            new_y = cy + (step if direction == 3 else -step if direction == 2 else 0)
+
+        if new_x > cx:
+            self.direction = 0
+        elif new_x < cx:
+            self.direction = 1
+        elif new_y < cy:
+            self.direction = 2
+        elif new_y > cy:
+            self.direction = 3
+
+        self.x_pos = new_x - 22
+        self.y_pos = new_y - 22
+        return True
+
     def calculate_target(self, player_x, player_y, player_direction, blinky_x=None, blinky_y=None):
         """
         Calculate the target position for the ghost based on its behavior.
@@ -445,13 +442,17 @@ class BaseGhost:
 
             if not (0 <= start_tile[0] < len(self.level[0]) and 0 <= start_tile[1] < len(self.level)):
                 return self.x_pos, self.y_pos, self.direction
-            if not (0 <= end_tile[0] < len(self.level[0]) and 0 <= end_tile[1] < len(self.level)):
+            if self.level[start_tile[1]][start_tile[0]] > 2:
                 return self.x_pos, self.y_pos, self.direction
 
-            if self.level[start_tile[1]][start_tile[0]] > 2 or self.level[end_tile[1]][end_tile[0]] > 2:
-                return self.x_pos, self.y_pos, self.direction
+            if self.level_graph is None:
+                self.level_graph = LevelGraph(self.level)
+            path_level = self.level_graph
 
-            path_level = convert_level_to_bitmask_maze(self.level)
+            # Projected targets (Pinky, Inky) often land in a wall or off the board
+            end_tile = path_level.nearest_walkable(*end_tile)
+            if end_tile is None:
+                return self.x_pos, self.y_pos, self.direction
 
             try:
                 self.path = self.path_algorithm(path_level, start_tile, end_tile, visualize=False)
@@ -497,7 +498,8 @@ class BaseGhost:
                 self.center_x = self.x_pos + TILE_WIDTH // 2
                 self.center_y = self.y_pos + TILE_HEIGHT // 2
 
-                pygame.draw.circle(self.screen, (255, 0, 255), (int(self.center_x), int(self.center_y)), 4)
+                if self.screen is not None:  # No screen in headless runs
+                    pygame.draw.circle(self.screen, (255, 0, 255), (int(self.center_x), int(self.center_y)), 4)
 
                 return self.x_pos, self.y_pos, self.direction
 
@@ -558,18 +560,22 @@ class BaseGhost:
         # Choose the right image based on ghost state
         if self.powerup() and not self.eaten_ghost()[self.id]:
             # Powerup mode (frightened)
-            ghost_image = self.powerup_img
+            ghost_image = self.sprites['powerup']
         elif self.is_returning_to_box:
             # Dead/returning to box
-            ghost_image = self.dead_img
+            ghost_image = self.sprites['dead']
         else:
             # Normal
-            ghost_image = self.img
+            ghost_image = self.sprites['normal']
 
         # Draw the ghost
         self.screen.blit(ghost_image, (self.x_pos, self.y_pos))
 
         # Return the ghost's rectangle for collision detection
+        return self.get_rect()
+
+    def get_rect(self):
+        """Collision rectangle of the ghost"""
         return pygame.Rect(self.x_pos, self.y_pos, 45, 45)
 
 
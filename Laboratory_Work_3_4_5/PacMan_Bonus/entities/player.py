@@ -1,14 +1,16 @@
 import pygame
 from setup.config import WIDTH, HEIGHT
+from entities.sprite_atlas import SpriteAtlas
 
 class Player:
-    def __init__(self, x, y, speed, images, direction=0):
+    def __init__(self, x, y, speed, images, direction=0, atlas=None):
         self.x = x
         self.y = y
         self.center_x = x + 23
         self.center_y = y + 24
         self.speed = speed
         self.images = images  # list of 4 animation frames
+        self.atlas = atlas if atlas is not None else SpriteAtlas.for_player(images)  # (direction, frame) -> image
         self.direction = direction
         self.command = direction
         self.counter = 0
@@ -28,14 +30,7 @@ class Player:
 
     def draw(self, screen):
         idx = self.counter // 5 % len(self.images)
-        if self.direction == 0:
-            screen.blit(self.images[idx], (self.x, self.y))
-        elif self.direction == 1:
-            screen.blit(pygame.transform.flip(self.images[idx], True, False), (self.x, self.y))
-        elif self.direction == 2:
-            screen.blit(pygame.transform.rotate(self.images[idx], 90), (self.x, self.y))
-        elif self.direction == 3:
-            screen.blit(pygame.transform.rotate(self.images[idx], 270), (self.x, self.y))
+        screen.blit(self.atlas[(self.direction, idx)], (self.x, self.y))
 
     def update_counter(self):
         if self.counter < 19:
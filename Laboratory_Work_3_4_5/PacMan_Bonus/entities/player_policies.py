@@ -0,0 +1,39 @@
+import random
+
+# Command letters used by scripted policies
+COMMANDS = {'R': 0, 'L': 1, 'U': 2, 'D': 3}
+
+
+class RandomPolicy:
+    """Keep going straight; pick a random open direction when blocked or by chance"""
+
+    def __init__(self, seed=None, turn_chance=0.02):
+        self.rng = random.Random(seed)
+        self.turn_chance = turn_chance
+
+    def __call__(self, frame, player, turns):
+        """Return the new player command, or None to keep the current one"""
+        if not turns[player.direction] or self.rng.random() < self.turn_chance:
+            options = [d for d in range(4) if turns[d]]
+            if options:
+                return self.rng.choice(options)
+        return None
+
+
+class ScriptedPolicy:
+    """Replay fixed key presses given as (frame, command) pairs"""
+
+    def __init__(self, script):
+        self.script = dict(script)
+
+    @classmethod
+    def parse(cls, text):
+        """Build a policy from text like '0:R,200:U,350:L'"""
+        script = []
+        for item in text.split(','):
+            frame, command = item.strip().split(':')
+            script.append((int(frame), COMMANDS[command.strip().upper()]))
+        return cls(script)
+
+    def __call__(self, frame, player, turns):
+        return self.script.get(frame)
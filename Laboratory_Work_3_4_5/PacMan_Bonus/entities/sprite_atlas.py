@@ -0,0 +1,42 @@
+import pygame
+
+
+class SpriteAtlas:
+    """
+    Pre-transformed sprite variants, looked up by key.
+
+    Flips and rotations are done once when the atlas is built, so drawing a sprite is a
+    single indexed blit with no per-frame Surface allocation.
+    """
+
+    def __init__(self):
+        self.sprites = {}
+
+    def add(self, key, surface):
+        self.sprites[key] = surface
+
+    def __getitem__(self, key):
+        return self.sprites[key]
+
+    def __contains__(self, key):
+        return key in self.sprites
+
+    @classmethod
+    def for_player(cls, images):
+        """Keys are (direction, frame): 0 right, 1 left, 2 up, 3 down"""
+        atlas = cls()
+        for frame, image in enumerate(images):
+            atlas.add((0, frame), image)
+            atlas.add((1, frame), pygame.transform.flip(image, True, False))
+            atlas.add((2, frame), pygame.transform.rotate(image, 90))
+            atlas.add((3, frame), pygame.transform.rotate(image, 270))
+        return atlas
+
+    @classmethod
+    def for_ghost(cls, normal_img, powerup_img, dead_img):
+        """Keys are 'normal', 'powerup' (frightened) and 'dead' (returning to the box)"""
+        atlas = cls()
+        atlas.add('normal', normal_img)
+        atlas.add('powerup', powerup_img)
+        atlas.add('dead', dead_img)
+        return atlas
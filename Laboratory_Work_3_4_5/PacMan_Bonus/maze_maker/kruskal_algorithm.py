@@ -161,8 +161,9 @@ def maze_to_tile_map(maze, scale=3):
     return tile_map
 
 
-def generate_and_save_tile_map(filename="maze_maker/kruskal_tile_map.pkl", display=None, seed=None):
-    grid, walls, dset = generate_kruskal_maze_grid(ROWS, COLS, seed)
+def generate_and_save_tile_map(filename="maze_maker/kruskal_tile_map.pkl", display=None, seed=None,
+                               rows=ROWS, cols=COLS):
+    grid, walls, dset = generate_kruskal_maze_grid(rows, cols, seed)
     maze = carve_maze(grid, walls, dset, display == "kruskal")
     tile_map = maze_to_tile_map(maze)
 
@@ -171,8 +172,8 @@ def generate_and_save_tile_map(filename="maze_maker/kruskal_tile_map.pkl", displ
         pygame.init()
         scale = 3
         cell_size = 20
-        width = COLS * scale * cell_size
-        height = ROWS * scale * cell_size
+        width = cols * scale * cell_size
+        height = rows * scale * cell_size
         screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("Pac-Man Tile Map Visualization")
 
@@ -222,9 +223,13 @@ if __name__ == "__main__":
                         help="Display mode: 'tile' for Pac-Man tile map, 'kruskal' for raw grid carving, or 'none'")
     parser.add_argument("--seed", type=int, default=None,
                         help="Optional random seed for reproducible maze generation")
+    parser.add_argument("--rows", type=int, default=ROWS, help="Maze cells per column (3 tiles each)")
+    parser.add_argument("--cols", type=int, default=COLS, help="Maze cells per row (3 tiles each)")
 
     args = parser.parse_args()
     generate_and_save_tile_map(
         display=(args.mode if args.mode != "none" else None),
-        seed=args.seed
+        seed=args.seed,
+        rows=args.rows,
+        cols=args.cols
     )
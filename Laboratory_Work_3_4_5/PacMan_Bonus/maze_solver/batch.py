@@ -0,0 +1,110 @@
+"""
+Batch path queries over one level, spread across worker processes.
+
+The level's flat walkability grid (see grid_search) is copied once into shared memory.
+Every worker maps it when it starts, so the queries sent to workers carry only tile
+pairs and no grid. Results are yielded as chunks complete, so tens of thousands of
+queries can be consumed, for example averaged, without holding every path at once.
+
+    from maze_solver.batch import solve_many
+    lengths = [length for _, _, length in solve_many(level, pairs, 'bfs', workers=4, lengths=True)]
+"""
+import os
+from multiprocessing import Pool, shared_memory
+from maze_solver import grid_search
+from maze_solver.jps import jump_point_search
+
+# Searches over a GridIndex, by name; any module-level function(grid, start, end) also works
+SEARCHES = {
+    'bfs': grid_search.bfs,
+    'bibfs': grid_search.bidirectional_bfs,
+    'dfs': grid_search.dfs,
+    'dijkstra': grid_search.dijkstra,
+    'jps': jump_point_search,
+}
+
+_worker = {}  # Per worker process: the shared memory block and the GridIndex over it
+
+
+def _attach(name, rows, cols):
+    """Pool initializer: map the shared grid instead of receiving a copy"""
+    block = shared_memory.SharedMemory(name=name)
+    grid = grid_search.GridIndex.from_buffer(rows, cols, block.buf[:(rows + 2) * (cols + 2)])
+    _worker['block'] = block
+    _worker['grid'] = grid
+
+
+def _solve_chunk(grid, search, chunk, lengths):
+    results = []
+    for start, end in chunk:
+        path = search(grid, start, end)
+        results.append((start, end, len(path) - 1 if lengths else path))
+    return results
+
+
+def _solve_shared(task):
+    search, chunk, lengths = task
+    return _solve_chunk(_worker['grid'], search, chunk, lengths)
+
+
+def _resolve(algorithm):
+    if callable(algorithm):
+        return algorithm
+    if algorithm not in SEARCHES:
+        raise ValueError(f"Unknown algorithm '{algorithm}', expected one of {', '.join(SEARCHES)}")
+    return SEARCHES[algorithm]
+
+
+def _valid(grid, tile):
+    x, y = tile
+    return 0 <= x < grid.cols and 0 <= y < grid.rows and grid.open[grid.index(x, y)]
+
+
+def solve_many(level, pairs, algorithm='bfs', workers=None, chunk_size=None, ordered=True, lengths=False):
+    """
+    Solve every (start, end) pair on level and yield (start, end, result) as results arrive.
+
+    result is the tile path ([] if there is none) or, with lengths=True, the number of
+    steps (-1 if there is none). algorithm is a name from SEARCHES or a picklable
+    function(grid, start, end). workers defaults to the CPU count; with one worker the
+    queries run in this process. ordered=False yields chunks in completion order.
+    Pairs with an endpoint off the level or in a wall get no path, without a search.
+    """
+    search = _resolve(algorithm)
+    grid = grid_search.grid_for(level)
+    pairs = [(tuple(start), tuple(end)) for start, end in pairs]
+    workers = workers or os.cpu_count() or 1
+
+    invalid = [not (_valid(grid, start) and _valid(grid, end)) for start, end in pairs]
+    queries = [pair for pair, skip in zip(pairs, invalid) if not skip]
+    missing = -1 if lengths else []
+
+    def merge(results):
+        # Put the skipped pairs back where they were in the input
+        results = iter(results)
+        for pair, skip in zip(pairs, invalid):
+            yield (*pair, missing) if skip else next(results)
+
+    if workers == 1 or len(queries) < 2:
+        yield from merge(_solve_chunk(grid, search, queries, lengths))
+        return
+
+    # Several chunks per worker keep them all busy when some queries are slower
+    chunk_size = chunk_size or max(1, min(1000, len(queries) // (workers * 8)))
+    chunks = [queries[i:i + chunk_size] for i in range(0, len(queries), chunk_size)]
+    tasks = [(search, chunk, lengths) for chunk in chunks]
+
+    block = shared_memory.SharedMemory(create=True, size=grid.size)
+    try:
+        block.buf[:grid.size] = grid.open
+        with Pool(workers, initializer=_attach, initargs=(block.name, grid.rows, grid.cols)) as pool:
+            if ordered:
+                yield from merge(result for chunk in pool.imap(_solve_shared, tasks) for result in chunk)
+            else:
+                for pair in (pair for pair, skip in zip(pairs, invalid) if skip):
+                    yield (*pair, missing)
+                for chunk in pool.imap_unordered(_solve_shared, tasks):
+                    yield from chunk
+    finally:
+        block.close()
+        block.unlink()
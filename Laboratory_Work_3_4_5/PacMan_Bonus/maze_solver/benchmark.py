@@ -0,0 +1,414 @@
+"""
+Benchmarks for the grid pathfinders, on the original board and on Kruskal mazes of
+growing size. Run from the PacMan_Bonus directory:
+
+    python -m maze_solver.benchmark --sizes 90 300 1000 2000
+    python -m maze_solver.benchmark --jps --sizes 90 300 1000
+    python -m maze_solver.benchmark --hpa --sizes 1000 2000
+    python -m maze_solver.benchmark --batch --sizes 300 --queries 20000 --workers 1 2 4 8
+    python -m maze_solver.benchmark --cells --sizes 100 300
+    python -m maze_solver.benchmark --bitboard --sizes 300 1000
+    python -m maze_solver.benchmark --distance-map --sizes 300 1000
+    python -m maze_solver.benchmark --sliced --sizes 300 1000 --budget 200
+
+The default mode times each flat-array search corner to corner against the
+dict/tuple version it replaced. --jps compares Jump Point Search with Dijkstra on
+random start/goal pairs, by node expansions and wall-clock time. --hpa times the
+hierarchical planner (build once, then queries) against bfs_path and reports how much
+longer its paths are. --batch measures solve_many throughput for each worker count.
+--cells times the headless cell-maze solvers of maze_search corner to corner.
+--bitboard races bit-parallel BFS against the tuple and flat BFS, on Kruskal mazes
+and on open boards with scattered walls. --distance-map times full NumPy distance maps
+against a dict BFS flood over the same bitmask maze. --sliced runs a time-sliced A*
+corner to corner in budget-sized calls and reports its slowest call, against one
+full dijkstra_path.
+"""
+import argparse
+import copy
+import heapq
+import random
+import sys
+import time
+from collections import deque
+from maze_solver import grid_search, maze_search
+from maze_solver.batch import solve_many
+from maze_solver.bitboard import BitMaze
+from maze_solver.frontier_bfs import PassageMasks, distance_map
+from maze_solver.hpa import HierarchicalGraph
+from maze_solver.jps import jump_point_search
+from maze_solver.level_graph import LevelGraph, convert_level_to_bitmask_maze
+from maze_solver.pathfinding_utils import bfs_path, dijkstra_path
+from maze_solver.sliced_search import SlicedPlanner, FRAME_BUDGET
+from maze_maker.kruskal_algorithm import generate_kruskal_maze_grid, carve_maze, maze_to_tile_map
+
+DIRECTIONS = [(0, -1), (0, 1), (1, 0), (-1, 0)]  # Up, Down, Right, Left
+
+
+# Reference versions: the previous pathfinding_utils searches, minus input checks
+def tuple_bfs(level, start, end):
+    queue = deque([start])
+    visited = {start: None}
+    while queue:
+        current = queue.popleft()
+        if current == end:
+            path = []
+            while current:
+                path.append(current)
+                current = visited[current]
+            return path[::-1]
+        for dx, dy in DIRECTIONS:
+            nx, ny = current[0] + dx, current[1] + dy
+            neighbor = (nx, ny)
+            if (0 <= nx < len(level[0]) and 0 <= ny < len(level) and
+                    level[ny][nx] <= 2 and neighbor not in visited):
+                queue.append(neighbor)
+                visited[neighbor] = current
+    return []
+
+
+def tuple_dfs(level, start, end):
+    stack = [start]
+    visited = {start: None}
+    while stack:
+        current = stack.pop()
+        if current == end:
+            path = []
+            while current:
+                path.append(current)
+                current = visited[current]
+            return path[::-1]
+        for dx, dy in reversed(DIRECTIONS):
+            nx, ny = current[0] + dx, current[1] + dy
+            neighbor = (nx, ny)
+            if (0 <= nx < len(level[0]) and 0 <= ny < len(level) and
+                    level[ny][nx] <= 2 and neighbor not in visited):
+                stack.append(neighbor)
+                visited[neighbor] = current
+    return []
+
+
+def tuple_dijkstra(level, start, end):
+    queue = [(0, start)]
+    visited = {start: (0, None)}
+    while queue:
+        cost, current = heapq.heappop(queue)
+        if current in visited and visited[current][0] < cost:
+            continue
+        if current == end:
+            path = []
+            while current:
+                path.append(current)
+                current = visited[current][1]
+            return path[::-1]
+        for dx, dy in DIRECTIONS:
+            nx, ny = current[0] + dx, current[1] + dy
+            neighbor = (nx, ny)
+            if 0 <= nx < len(level[0]) and 0 <= ny < len(level) and level[ny][nx] <= 2:
+                new_cost = cost + 1
+                if neighbor not in visited or new_cost < visited[neighbor][0]:
+                    visited[neighbor] = (new_cost, current)
+                    heapq.heappush(queue, (new_cost, neighbor))
+    return []
+
+
+ALGORITHMS = {
+    'bfs': (tuple_bfs, grid_search.bfs),
+    'dfs': (tuple_dfs, grid_search.dfs),
+    'dijkstra': (tuple_dijkstra, grid_search.dijkstra),
+}
+
+
+def kruskal_level(size, seed=0):
+    """Kruskal tile map of about size x size tiles (3 tiles per maze cell)"""
+    cells = max(2, size // 3)
+    return maze_to_tile_map(carve_maze(*generate_kruskal_maze_grid(cells, cells, seed)))
+
+
+def open_level(size, seed=0, walls=0.25):
+    """size x size tile map with a fraction of random wall tiles: wide BFS frontiers"""
+    rng = random.Random(seed)
+    return [[4 if rng.random() < walls else 0 for _ in range(size)] for _ in range(size)]
+
+
+def original_level():
+    from board import boards
+    from setup.level_loader import open_ghost_box
+    return open_ghost_box(copy.deepcopy(boards))
+
+
+def corners(level):
+    """First and last walkable tiles in row-major order"""
+    tiles = [(x, y) for y, row in enumerate(level) for x, tile in enumerate(row) if tile <= 2]
+    return tiles[0], tiles[-1]
+
+
+def best_time(function, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(sizes, algorithms, repeat=3, seed=0):
+    """Print one row per (level, algorithm); returns the rows as dicts"""
+    cases = [('original', original_level())] + [(f'kruskal {size}', kruskal_level(size, seed)) for size in sizes]
+    results = []
+
+    print(f"{'level':<14}{'tiles':>12}{'algorithm':>10}{'tuple ms':>12}{'flat ms':>11}{'speedup':>9}")
+    for name, level in cases:
+        start, end = corners(level)
+        graph = LevelGraph(level)
+        grid = grid_search.grid_for(graph)
+        for algorithm in algorithms:
+            reference, flat = ALGORITHMS[algorithm]
+            old_time, old_path = best_time(lambda: reference(level, start, end), repeat)
+            new_time, new_path = best_time(lambda: flat(grid, start, end), repeat)
+            if old_path != new_path:
+                print(f"Path mismatch for {algorithm} on {name}", file=sys.stderr)
+
+            tiles = f"{len(level[0])}x{len(level)}"
+            speedup = old_time / new_time if new_time > 0 else float('inf')
+            print(f"{name:<14}{tiles:>12}{algorithm:>10}{old_time * 1000:>12.2f}"
+                  f"{new_time * 1000:>11.2f}{speedup:>8.1f}x")
+            results.append({'level': name, 'tiles': tiles, 'algorithm': algorithm,
+                            'tuple_ms': old_time * 1000, 'flat_ms': new_time * 1000})
+    return results
+
+
+def run_jps(sizes, queries=50, seed=0):
+    """Print JPS vs Dijkstra expansions and time over random pairs; returns the rows"""
+    cases = [('original', original_level())] + [(f'kruskal {size}', kruskal_level(size, seed)) for size in sizes]
+    rng = random.Random(seed)
+    results = []
+
+    print(f"{'level':<14}{'tiles':>12}{'dijkstra exp':>14}{'jps exp':>10}{'dijkstra ms':>13}{'jps ms':>9}")
+    for name, level in cases:
+        grid = grid_search.GridIndex(level)
+        tiles = [(x, y) for y, row in enumerate(level) for x, tile in enumerate(row) if tile <= 2]
+        pairs = [(rng.choice(tiles), rng.choice(tiles)) for _ in range(queries)]
+        totals = {'dijkstra': [0, 0.0], 'jps': [0, 0.0]}
+
+        for start, end in pairs:
+            lengths = []
+            for algorithm, search in (('dijkstra', grid_search.dijkstra), ('jps', jump_point_search)):
+                stats = {}
+                started = time.perf_counter()
+                path = search(grid, start, end, stats)
+                totals[algorithm][1] += time.perf_counter() - started
+                totals[algorithm][0] += stats['expanded']
+                lengths.append(len(path))
+            if lengths[0] != lengths[1]:
+                print(f"Path length mismatch on {name}: {start} -> {end}", file=sys.stderr)
+
+        tiles = f"{len(level[0])}x{len(level)}"
+        print(f"{name:<14}{tiles:>12}{totals['dijkstra'][0]:>14}{totals['jps'][0]:>10}"
+              f"{totals['dijkstra'][1] * 1000:>13.1f}{totals['jps'][1] * 1000:>9.1f}")
+        results.append({'level': name, 'tiles': tiles,
+                        'dijkstra_expanded': totals['dijkstra'][0], 'jps_expanded': totals['jps'][0],
+                        'dijkstra_ms': totals['dijkstra'][1] * 1000, 'jps_ms': totals['jps'][1] * 1000})
+    return results
+
+
+def run_hpa(sizes, queries=50, seed=0, cluster_size=16):
+    """Print HPA* vs BFS query time and path length over random pairs; returns the rows"""
+    rng = random.Random(seed)
+    results = []
+
+    print(f"{'level':<14}{'tiles':>12}{'build ms':>10}{'bfs ms':>10}{'hpa ms':>9}"
+          f"{'speedup':>9}{'avg len':>9}{'max len':>9}")
+    for size in sizes:
+        name = f'kruskal {size}'
+        level = LevelGraph(kruskal_level(size, seed))
+        tiles = [(x, y) for y, row in enumerate(level) for x, tile in enumerate(row) if tile <= 2]
+        pairs = [(rng.choice(tiles), rng.choice(tiles)) for _ in range(queries)]
+
+        build_time, graph = best_time(lambda: HierarchicalGraph(level, cluster_size), 1)
+        bfs_time = hpa_time = 0.0
+        ratios = []
+        for start, end in pairs:
+            started = time.perf_counter()
+            shortest = bfs_path(level, start, end)
+            bfs_time += time.perf_counter() - started
+            started = time.perf_counter()
+            path = graph.find_path(start, end)
+            hpa_time += time.perf_counter() - started
+            if len(shortest) != len(path) and not (shortest and path):
+                print(f"Reachability mismatch on {name}: {start} -> {end}", file=sys.stderr)
+            elif shortest:
+                ratios.append((len(path) - 1) / max(1, len(shortest) - 1))
+
+        average = sum(ratios) / len(ratios) if ratios else 1.0
+        worst = max(ratios, default=1.0)
+        speedup = bfs_time / hpa_time if hpa_time > 0 else float('inf')
+        print(f"{name:<14}{len(level[0]):>5}x{len(level):<6}{build_time * 1000:>10.0f}{bfs_time * 1000:>10.1f}"
+              f"{hpa_time * 1000:>9.1f}{speedup:>8.1f}x{average:>9.3f}{worst:>9.3f}")
+        results.append({'level': name, 'build_ms': build_time * 1000, 'bfs_ms': bfs_time * 1000,
+                        'hpa_ms': hpa_time * 1000, 'avg_length_ratio': average, 'max_length_ratio': worst})
+    return results
+
+
+def run_batch(sizes, queries=20000, workers=(1, 2, 4), seed=0):
+    """Print solve_many BFS throughput per worker count on random pairs; returns the rows"""
+    rng = random.Random(seed)
+    results = []
+
+    print(f"{'level':<14}{'tiles':>12}{'workers':>9}{'seconds':>10}{'queries/s':>11}{'scaling':>9}{'avg len':>9}")
+    for size in sizes:
+        name = f'kruskal {size}'
+        level = kruskal_level(size, seed)
+        tiles = [(x, y) for y, row in enumerate(level) for x, tile in enumerate(row) if tile <= 2]
+        pairs = [(rng.choice(tiles), rng.choice(tiles)) for _ in range(queries)]
+
+        baseline = None
+        for count in workers:
+            started = time.perf_counter()
+            lengths = [length for _, _, length in solve_many(level, pairs, 'bfs', workers=count, lengths=True)]
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+
+            tiles = f"{len(level[0])}x{len(level)}"
+            average = sum(lengths) / len(lengths)
+            print(f"{name:<14}{tiles:>12}{count:>9}{elapsed:>10.2f}{queries / elapsed:>11.0f}"
+                  f"{baseline / elapsed:>8.2f}x{average:>9.1f}")
+            results.append({'level': name, 'workers': count, 'seconds': elapsed,
+                            'queries_per_second': queries / elapsed, 'average_length': average})
+    return results
+
+
+def run_cells(sizes, repeat=3, seed=0):
+    """Print maze_search solver times on size x size cell Kruskal mazes; returns the rows"""
+    results = []
+
+    print(f"{'level':<14}{'cells':>12}{'algorithm':>18}{'ms':>10}{'path':>8}")
+    for size in sizes:
+        name = f'kruskal {size}'
+        maze = carve_maze(*generate_kruskal_maze_grid(size, size, seed))
+        start, end = maze_search.corners(maze)
+        for algorithm, solver in maze_search.SOLVERS.items():
+            elapsed, (path, _) = best_time(lambda: solver(maze, start, end), repeat)
+            print(f"{name:<14}{f'{size}x{size}':>12}{algorithm:>18}{elapsed * 1000:>10.1f}{len(path):>8}")
+            results.append({'level': name, 'algorithm': algorithm, 'ms': elapsed * 1000, 'path': len(path)})
+    return results
+
+
+def run_bitboard(sizes, repeat=3, seed=0):
+    """Print tuple, flat and bit-parallel BFS times corner to corner; returns the rows"""
+    cases = [('original', original_level())]
+    for size in sizes:
+        cases += [(f'kruskal {size}', kruskal_level(size, seed)), (f'open {size}', open_level(size, seed))]
+    results = []
+
+    print(f"{'level':<14}{'tiles':>12}{'tuple ms':>10}{'flat ms':>9}{'bits ms':>9}{'build ms':>10}{'vs tuple':>10}")
+    for name, level in cases:
+        start, end = corners(level)
+        tuple_time, expected = best_time(lambda: tuple_bfs(level, start, end), repeat)
+        flat_time, _ = best_time(lambda: grid_search.bfs(grid_search.GridIndex(level), start, end), repeat)
+        build_time, maze = best_time(lambda: BitMaze.from_tiles(level), repeat)
+        bits_time, path = best_time(lambda: maze.path(start, end), repeat)
+        if len(path) != len(expected):
+            print(f"Path length mismatch on {name}", file=sys.stderr)
+
+        tiles = f"{len(level[0])}x{len(level)}"
+        speedup = tuple_time / (build_time + bits_time)
+        print(f"{name:<14}{tiles:>12}{tuple_time * 1000:>10.1f}{flat_time * 1000:>9.1f}{bits_time * 1000:>9.1f}"
+              f"{build_time * 1000:>10.1f}{speedup:>9.1f}x")
+        results.append({'level': name, 'tiles': tiles, 'tuple_ms': tuple_time * 1000, 'flat_ms': flat_time * 1000,
+                        'bits_ms': bits_time * 1000, 'build_ms': build_time * 1000})
+    return results
+
+
+def run_distance_maps(sizes, repeat=3, seed=0):
+    """Print NumPy distance map vs dict BFS flood times from a corner; returns the rows"""
+    results = []
+
+    print(f"{'level':<14}{'cells':>12}{'dict ms':>10}{'numpy ms':>10}{'masks ms':>10}{'speedup':>9}")
+    for size in sizes:
+        cases = [(f'kruskal {size}', carve_maze(*generate_kruskal_maze_grid(size, size, seed))),
+                 (f'open {size}', convert_level_to_bitmask_maze(open_level(size, seed)))]
+        for name, maze in cases:
+            dict_time, _ = best_time(lambda: maze_search.bfs(maze, (0, 0), None), repeat)
+            masks_time, masks = best_time(lambda: PassageMasks(maze), repeat)
+            numpy_time, _ = best_time(lambda: distance_map(maze, (0, 0), masks), repeat)
+
+            speedup = dict_time / (masks_time + numpy_time)
+            print(f"{name:<14}{f'{size}x{size}':>12}{dict_time * 1000:>10.1f}{numpy_time * 1000:>10.1f}"
+                  f"{masks_time * 1000:>10.1f}{speedup:>8.1f}x")
+            results.append({'level': name, 'dict_ms': dict_time * 1000, 'numpy_ms': numpy_time * 1000,
+                            'masks_ms': masks_time * 1000})
+    return results
+
+
+def run_sliced(sizes, budget=FRAME_BUDGET, seed=0):
+    """Print the worst single call of a sliced search vs one dijkstra_path call; returns the rows"""
+    results = []
+
+    print(f"{'level':<14}{'tiles':>12}{'dijkstra ms':>13}{'calls':>8}{'worst ms':>10}{'mean ms':>9}{'same len':>10}")
+    for size in sizes:
+        name = f'kruskal {size}'
+        level = LevelGraph(kruskal_level(size, seed))
+        start, end = corners(level)
+        started = time.perf_counter()
+        shortest = dijkstra_path(level, start, end)
+        dijkstra_time = time.perf_counter() - started
+
+        planner = SlicedPlanner(budget)
+        planner.reset(level)  # Builds the level's GridIndex outside the timed calls
+        calls = []
+        while True:
+            started = time.perf_counter()
+            planner(level, start, end)
+            calls.append(time.perf_counter() - started)
+            if planner.search is None:
+                break
+        path = planner.settled.route(start, steps=None) if planner.settled is not None else []
+
+        worst, mean = max(calls), sum(calls) / len(calls)
+        print(f"{name:<14}{len(level[0]):>5}x{len(level):<6}{dijkstra_time * 1000:>13.1f}{len(calls):>8}"
+              f"{worst * 1000:>10.2f}{mean * 1000:>9.3f}{str(len(path) == len(shortest)):>10}")
+        results.append({'level': name, 'dijkstra_ms': dijkstra_time * 1000, 'calls': len(calls),
+                        'worst_ms': worst * 1000, 'mean_ms': mean * 1000})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the flat-array grid search core")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[90, 300, 1000, 2000],
+                        help="Side lengths, in tiles, of the generated Kruskal mazes")
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    parser.add_argument("--seed", type=int, default=0, help="Maze generation seed")
+    parser.add_argument("--jps", action="store_true", help="Compare Jump Point Search with Dijkstra instead")
+    parser.add_argument("--hpa", action="store_true", help="Compare hierarchical pathfinding with BFS instead")
+    parser.add_argument("--cluster-size", type=int, default=16, help="Cluster side in tiles (--hpa)")
+    parser.add_argument("--batch", action="store_true", help="Measure solve_many throughput instead")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                        help="Worker process counts to try (--batch)")
+    parser.add_argument("--cells", action="store_true", help="Time the cell-maze solvers of maze_search instead")
+    parser.add_argument("--bitboard", action="store_true", help="Compare bit-parallel BFS with the BFS versions instead")
+    parser.add_argument("--distance-map", action="store_true", help="Time NumPy distance maps against a BFS flood instead")
+    parser.add_argument("--sliced", action="store_true", help="Time a budgeted sliced search against Dijkstra instead")
+    parser.add_argument("--budget", type=int, default=FRAME_BUDGET, help="Tile expansions per call (--sliced)")
+    parser.add_argument("--queries", type=int, default=None,
+                        help="Random start/goal pairs per level (default 50, or 20000 with --batch)")
+
+    args = parser.parse_args()
+    if args.jps:
+        run_jps(args.sizes, args.queries or 50, args.seed)
+    elif args.hpa:
+        run_hpa(args.sizes, args.queries or 50, args.seed, args.cluster_size)
+    elif args.batch:
+        run_batch(args.sizes, args.queries or 20000, args.workers, args.seed)
+    elif args.cells:
+        run_cells(args.sizes, args.repeat, args.seed)
+    elif args.bitboard:
+        run_bitboard(args.sizes, args.repeat, args.seed)
+    elif args.distance_map:
+        run_distance_maps(args.sizes, args.repeat, args.seed)
+    elif args.sliced:
+        run_sliced(args.sizes, args.budget, args.seed)
+    else:
+        run(args.sizes, args.algorithms, args.repeat, args.seed)
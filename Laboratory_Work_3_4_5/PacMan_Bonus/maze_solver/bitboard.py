@@ -0,0 +1,241 @@
+"""
+Bit-parallel BFS on Python integers.
+
+Every cell of a maze is one bit of an int, row by row (bit y * cols + x). For each
+direction a mask holds the cells that can step that way, so a whole BFS frontier moves
+one step with four ANDs and four shifts, and one layer of the search costs a handful of
+big-int operations however wide it is.
+
+Those operations cost time in proportion to the whole maze, though, which only pays
+off while the frontier is wide (open boards, braided mazes). Perfect mazes have
+thousands of layers a few cells wide, so a narrow frontier is kept as a list of cell
+indices instead and stepped cell by cell over flat per-direction flags, switching back
+to ints when it widens again, as frontier_bfs does with NumPy arrays.
+"""
+from array import array
+from maze_solver.maze_search import N, S, E, W
+from maze_solver.pathfinding_utils import check_endpoints
+
+WALKABLE_TILE = 2  # Tile codes up to this one are walkable on a Pac-Man tile map
+DENSE_FRACTION = 256  # Frontiers above 1/256 of the cells are expanded as ints
+
+# '0'/'1' digits <-> 0/1 bytes, for converting between ints and per-cell flags
+_FROM_DIGITS = bytes.maketrans(b'01', b'\x00\x01')
+_TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+_TO_INVERTED_DIGITS = bytes.maketrans(b'\x00\x01', b'10')
+_WALKABLE_DIGITS = bytes(ord('1') if code <= WALKABLE_TILE else ord('0') for code in range(256))
+
+
+def bits(mask):
+    """Indices of the set bits of mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitMaze:
+    """Passability masks of a maze as ints; build with BitMaze(cell grid) or BitMaze.from_tiles"""
+
+    def __init__(self, grid):
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if self.rows > 0 else 0
+        self.size = self.rows * self.cols
+        open_sides = {N: 0, S: 0, E: 0, W: 0}
+        for side in open_sides:
+            flags = ''.join('1' if cell & side else '0' for row in reversed(grid) for cell in reversed(row))
+            open_sides[side] = int(flags or '0', 2)
+        self._set_masks(open_sides[N], open_sides[S], open_sides[E], open_sides[W])
+
+    @classmethod
+    def from_tiles(cls, level):
+        """BitMaze of a Pac-Man tile map: tiles 0-2 are open, and open tiles are joined to their open neighbours"""
+        maze = cls.__new__(cls)
+        maze.rows = len(level)
+        maze.cols = len(level[0]) if maze.rows > 0 else 0
+        maze.size = maze.rows * maze.cols
+        digits = b''.join(bytes(row).translate(_WALKABLE_DIGITS) for row in level)
+        walkable = int(digits[::-1] or b'0', 2)
+        maze._set_masks(walkable & (walkable << maze.cols), walkable & (walkable >> maze.cols),
+                        walkable & (walkable >> 1), walkable & (walkable << 1))
+        return maze
+
+    def _set_masks(self, north, south, east, west):
+        first_column = sum(1 << (y * self.cols) for y in range(self.rows))
+        last_column = first_column << max(0, self.cols - 1)
+        everything = (1 << self.size) - 1
+        # Cells that may step each way; steps off the board or across a row end are dropped
+        self.north = north & everything & ~((1 << self.cols) - 1)
+        self.south = south & everything & (everything >> self.cols)
+        self.east = east & everything & ~last_column
+        self.west = west & everything & ~first_column
+        self._steps = None  # Per-cell flags of the masks, built on first narrow frontier
+
+    def flags(self, mask):
+        """One byte per cell, 1 where the bit of mask is set"""
+        return format(mask, f'0{self.size}b')[::-1].encode().translate(_FROM_DIGITS)
+
+    def mask(self, flags, inverted=False):
+        """Int with the bits of the cells flagged 1 in flags (0 if inverted)"""
+        digits = bytes(flags).translate(_TO_INVERTED_DIGITS if inverted else _TO_DIGITS)
+        return int(digits[::-1] or b'0', 2)
+
+    def steps(self):
+        """Per-cell flags of the north, south, east and west masks"""
+        if self._steps is None:
+            self._steps = tuple(self.flags(mask) for mask in (self.north, self.south, self.east, self.west))
+        return self._steps
+
+    def cells(self, layer):
+        """Cells of one of the layers"""
+        indices = bits(layer) if isinstance(layer, int) else layer
+        return [self.cell(index) for index in indices]
+
+    def index(self, cell):
+        x, y = cell
+        return y * self.cols + x
+
+    def cell(self, index):
+        y, x = divmod(index, self.cols)
+        return (x, y)
+
+    def expand(self, frontier):
+        """Every cell one step from a cell of frontier"""
+        cols = self.cols
+        return (((frontier & self.north) >> cols) | ((frontier & self.south) << cols) |
+                ((frontier & self.east) << 1) | ((frontier & self.west) >> 1))
+
+    def predecessors(self, cells):
+        """Every cell with a step into a cell of cells"""
+        cols = self.cols
+        return (((cells << cols) & self.north) | ((cells >> cols) & self.south) |
+                ((cells >> 1) & self.east) | ((cells << 1) & self.west))
+
+    def layers(self, start, end=None):
+        """
+        BFS layers from start: layers[d] holds the cells d steps away, as an int bitset
+        when the layer is wide and as a list of cell indices when it is narrow. Stops
+        after the layer holding end, if given, or when nothing new is reached.
+        """
+        return self._search(start, end)[0]
+
+    def _search(self, start, end):
+        """(layers, depth) where depth[i] is the step count of cell i if it was in a narrow layer"""
+        size, cols = self.size, self.cols
+        limit = max(1, size // DENSE_FRACTION)
+        source = self.index(start)
+        target = self.index(end) if end is not None else -1
+        depth = array('i', [-1]) * size
+        depth[source] = 0
+        seen = bytearray(size)
+        seen[source] = 1
+        unseen = None  # Int of the unseen cells while the frontier is an int
+        layer = [source]
+        layers = [layer]
+
+        while True:
+            if isinstance(layer, int):
+                if target >= 0 and layer >> target & 1:
+                    break
+                layer = self.expand(layer) & unseen
+                if not layer:
+                    break
+                unseen ^= layer
+                layers.append(layer)
+                if layer.bit_count() <= limit // 2:
+                    seen = bytearray(self.flags(unseen).translate(_TO_INVERTED_DIGITS).translate(_FROM_DIGITS))
+                    layer = list(self._indices(self.flags(layer)))
+                    layers[-1] = layer
+                    for index in layer:
+                        depth[index] = len(layers) - 1
+            else:
+                if target >= 0 and depth[target] >= 0:
+                    break
+                north, south, east, west = self.steps()
+                distance = len(layers)
+                reached = []
+                for index in layer:
+                    if north[index] and not seen[index - cols]:
+                        seen[index - cols] = 1
+                        reached.append(index - cols)
+                    if south[index] and not seen[index + cols]:
+                        seen[index + cols] = 1
+                        reached.append(index + cols)
+                    if east[index] and not seen[index + 1]:
+                        seen[index + 1] = 1
+                        reached.append(index + 1)
+                    if west[index] and not seen[index - 1]:
+                        seen[index - 1] = 1
+                        reached.append(index - 1)
+                if not reached:
+                    break
+                for index in reached:
+                    depth[index] = distance
+                layer = reached
+                layers.append(layer)
+                if len(layer) > limit:
+                    unseen = self.mask(seen, inverted=True)
+                    flags = bytearray(size)
+                    for index in layer:
+                        flags[index] = 1
+                    layer = self.mask(flags)
+                    layers[-1] = layer
+        return layers, depth
+
+    @staticmethod
+    def _indices(flags):
+        index = flags.find(1)
+        while index >= 0:
+            yield index
+            index = flags.find(1, index + 1)
+
+    def distance(self, layers, cell):
+        """Steps to cell according to layers, or -1 if it was not reached"""
+        index = self.index(cell)
+        for distance, layer in enumerate(layers):
+            if layer >> index & 1 if isinstance(layer, int) else index in layer:
+                return distance
+        return -1
+
+    def path(self, start, end):
+        """Shortest path from start to end as cells, or [] if end cannot be reached"""
+        layers, depth = self._search(start, end)
+        last = layers[-1]
+        target = self.index(end)
+        if not (last >> target & 1 if isinstance(last, int) else depth[target] >= 0):
+            return []
+
+        cols = self.cols
+        north, south, east, west = self.steps() if any(isinstance(layer, list) for layer in layers) else ((),) * 4
+        current = target
+        path = [tuple(end)]
+        for distance in range(len(layers) - 2, -1, -1):
+            layer = layers[distance]
+            if isinstance(layer, int):
+                step = self.predecessors(1 << current) & layer
+                current = (step & -step).bit_length() - 1  # Any predecessor one layer closer will do
+            else:
+                # A cell of the narrow layer with a step into current
+                for previous, can_step in ((current + cols, north), (current - cols, south),
+                                           (current - 1, east), (current + 1, west)):
+                    if 0 <= previous < self.size and depth[previous] == distance and can_step[previous]:
+                        current = previous
+                        break
+            path.append(self.cell(current))
+        return path[::-1]
+
+
+def bitboard_bfs(grid, start, end):
+    """Shortest path on a cell maze (maze_search format) using bit-parallel BFS"""
+    return BitMaze(grid).path(start, end)
+
+
+def bitboard_bfs_path(level, start, end, visualize=False):
+    """Bit-parallel BFS that works with the Pac-Man level format"""
+    if not check_endpoints(level, start, end):
+        return []
+
+    path = BitMaze.from_tiles(level).path(start, end)
+    if not path:
+        print("No path found")
+    return path
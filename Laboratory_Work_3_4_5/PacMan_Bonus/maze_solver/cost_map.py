@@ -0,0 +1,52 @@
+"""Per-tile movement costs for weighted ghost path planning"""
+from maze_solver import grid_search
+
+MAX_TILE_COST = 255
+
+
+class CostMap:
+    """
+    Cost of entering each tile of a level, as small positive integers laid out like
+    the level's GridIndex, so grid_search.dial can read them directly.
+
+    Start from reset() and add penalties on top of the base cost; version goes up on
+    every change so that cached paths planned against older costs can be told apart.
+    """
+
+    def __init__(self, level, base=1):
+        self.base = base
+        self.version = 0
+        self.attach(grid_search.grid_for(level))
+
+    def attach(self, grid):
+        """Use a (new) GridIndex layout, dropping all penalties"""
+        self.grid = grid
+        self.costs = bytearray([self.base]) * grid.size
+        self.max_cost = self.base
+        self.version += 1
+
+    def reset(self):
+        """Back to the base cost everywhere"""
+        if self.max_cost != self.base:
+            self.costs[:] = bytearray([self.base]) * self.grid.size
+            self.max_cost = self.base
+        self.version += 1
+
+    def cost(self, x, y):
+        return self.costs[self.grid.index(x, y)]
+
+    def add(self, x, y, extra):
+        """Add a penalty to one tile (ignored off the level)"""
+        if 0 <= x < self.grid.cols and 0 <= y < self.grid.rows:
+            index = self.grid.index(x, y)
+            cost = min(MAX_TILE_COST, self.costs[index] + extra)
+            self.costs[index] = cost
+            self.max_cost = max(self.max_cost, cost)
+            self.version += 1
+
+    def add_area(self, x, y, radius, extra):
+        """Add a penalty to every tile within Manhattan distance radius of (x, y)"""
+        for dy in range(-radius, radius + 1):
+            span = radius - abs(dy)
+            for dx in range(-span, span + 1):
+                self.add(x + dx, y + dy, extra)
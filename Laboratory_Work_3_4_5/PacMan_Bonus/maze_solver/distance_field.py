@@ -0,0 +1,146 @@
+"""
+Distance fields shared by all ghosts.
+
+Instead of every ghost searching from its own tile every frame, one BFS flood is run
+from each distinct target tile and its step counts are kept. A ghost then takes its
+next step by moving to a neighbour one step closer to the target, which is O(1).
+A flood is only redone when a target moves to another tile, so four ghosts chasing
+targets derived from Pac-Man cost far less than one search per frame on average.
+"""
+import time
+from array import array
+from collections import OrderedDict
+from maze_solver import grid_search
+from maze_solver.pathfinding_utils import check_endpoints
+from maze_solver.search_stats import finish_stats
+
+
+class DistanceField:
+    """
+    Cache of BFS distance fields keyed by target tile, usable as a path algorithm.
+
+    One instance is shared by all ghosts of a level. Fields are dropped when the level
+    graph's version changes, and only the max_fields most recently used are kept.
+    """
+
+    def __init__(self, max_fields=8):
+        self.max_fields = max_fields
+        self.grid = None
+        self.fields = OrderedDict()  # Target index -> distances to it (array, -1 = unreachable)
+        self.floods = 0
+        self.queries = 0
+
+    def field(self, level, target, stats=None):
+        """
+        Distance field towards target (x, y), flooding it if it is not cached. stats gets
+        the flood's work counters, or zeros when the field was cached.
+        """
+        grid = grid_search.grid_for(level)
+        if grid is not self.grid:  # New level, or the walls changed
+            self.grid = grid
+            self.fields.clear()
+
+        index = grid.index(*target)
+        distances = self.fields.get(index)
+        if distances is not None:
+            self.fields.move_to_end(index)
+            if stats is not None:
+                stats.update(expanded=0, pushed=0, peak_frontier=0)
+            return distances
+
+        distances = self.flood(grid, index, stats)
+        self.fields[index] = distances
+        if len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+        return distances
+
+    def flood(self, grid, source, stats=None):
+        """BFS step counts from source to every reachable tile; nothing is reachable from a wall"""
+        self.floods += 1
+        cells = grid.open
+        offsets = grid.offsets
+        distances = array('i', [-1]) * grid.size
+        if not cells[source]:
+            return distances
+        distances[source] = 0
+
+        queue = [source]
+        for current in queue:  # The list grows while it is iterated
+            depth = distances[current] + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if cells[neighbor] and distances[neighbor] < 0:
+                    distances[neighbor] = depth
+                    queue.append(neighbor)
+        if stats is not None:
+            self._flood_stats(stats, grid, queue, distances)
+        return distances
+
+    @staticmethod
+    def _flood_stats(stats, grid, queue, distances):
+        """
+        Work counters of a flood from its final queue, like grid_search._queue_stats.
+        A tile was queued by the earliest queued neighbour one step nearer the source,
+        at which point the tiles after that neighbour up to it were waiting.
+        """
+        position = {tile: i for i, tile in enumerate(queue)}
+        peak = 1
+        for j in range(1, len(queue)):
+            tile = queue[j]
+            nearer = distances[tile] - 1
+            parent = min(position[tile + offset] for offset in grid.offsets
+                         if distances[tile + offset] == nearer)
+            if j - parent > peak:
+                peak = j - parent
+        stats.update(expanded=len(queue), pushed=len(queue), peak_frontier=peak)
+
+    def distance(self, level, start, end):
+        """Steps from start to end, or -1 if end cannot be reached"""
+        return self.field(level, end)[self.grid.index(*start)]
+
+    def next_tile(self, level, start, end, stats=None):
+        """Neighbour of start one step closer to end (up, down, right, left on ties), or None"""
+        self.queries += 1
+        distances = self.field(level, end, stats)
+        grid = self.grid
+        current = grid.index(*start)
+        depth = distances[current]
+        if depth <= 0:
+            return None
+        for offset in grid.offsets:
+            if distances[current + offset] == depth - 1:
+                return grid.tile(current + offset)
+        return None
+
+    def path(self, level, start, end):
+        """Full tile path from start to end by descending the field"""
+        distances = self.field(level, end)
+        grid = self.grid
+        current = grid.index(*start)
+        if distances[current] < 0:
+            return []
+
+        path = [tuple(start)]
+        while distances[current] > 0:
+            depth = distances[current]
+            for offset in grid.offsets:
+                if distances[current + offset] == depth - 1:
+                    current += offset
+                    break
+            path.append(grid.tile(current))
+        return path
+
+    def __call__(self, level, start, end, visualize=False, stats=None):
+        """
+        Path algorithm interface for ghosts. Ghosts replan every frame and only follow
+        the first step, so just [start, next tile] is returned ([start] at the goal).
+        """
+        started = time.perf_counter()
+        if not check_endpoints(level, start, end):
+            return finish_stats(stats, [], started)
+        step = self.next_tile(level, start, end, stats)
+        if step is None:
+            path = [tuple(start)] if tuple(start) == tuple(end) else []
+        else:
+            path = [tuple(start), step]
+        return finish_stats(stats, path, started)
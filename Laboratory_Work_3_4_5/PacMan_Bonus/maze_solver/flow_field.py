@@ -0,0 +1,56 @@
+"""Static flow fields: the direction to move from every tile towards a set of goal tiles"""
+from collections import deque
+
+# Ghost direction codes for each step, in the BFS neighbour order (up, down, right, left)
+STEPS = [(2, 0, -1), (3, 0, 1), (0, 1, 0), (1, -1, 0)]
+REVERSE = {0: 1, 1: 0, 2: 3, 3: 2}
+NO_DIRECTION = 255
+
+
+class FlowField:
+    """
+    One multi-source BFS from the goal tiles, stored as a direction per tile.
+
+    direction(x, y) is then an O(1) lookup of the first step of a shortest,
+    wall-respecting path to the nearest goal.
+    """
+
+    def __init__(self, level, goals):
+        self.rows = len(level)
+        self.cols = len(level[0]) if self.rows > 0 else 0
+        self.goals = set(goals)
+        self.directions = bytearray([NO_DIRECTION]) * (self.rows * self.cols)
+        self.distances = [-1] * (self.rows * self.cols)
+
+        queue = deque()
+        for x, y in self.goals:
+            if 0 <= x < self.cols and 0 <= y < self.rows and level[y][x] <= 2:
+                self.distances[y * self.cols + x] = 0
+                queue.append((x, y))
+
+        while queue:
+            x, y = queue.popleft()
+            depth = self.distances[y * self.cols + x] + 1
+            for direction, dx, dy in STEPS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < self.cols and 0 <= ny < self.rows and level[ny][nx] <= 2:
+                    index = ny * self.cols + nx
+                    if self.distances[index] < 0:
+                        self.distances[index] = depth
+                        # Reached by stepping `direction`, so head back the opposite way
+                        self.directions[index] = REVERSE[direction]
+                        queue.append((nx, ny))
+
+    def direction(self, x, y):
+        """Ghost direction (0 right, 1 left, 2 up, 3 down) towards the goals, or None
+        on a goal tile, a wall, an unreachable tile or off the level"""
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return None
+        direction = self.directions[y * self.cols + x]
+        return None if direction == NO_DIRECTION else direction
+
+    def distance(self, x, y):
+        """Steps to the nearest goal, or -1"""
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return -1
+        return self.distances[y * self.cols + x]
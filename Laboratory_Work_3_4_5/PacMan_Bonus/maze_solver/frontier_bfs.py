@@ -0,0 +1,108 @@
+"""
+Level-synchronous BFS distance maps with NumPy, for whole-maze analysis.
+
+Input is the cell bitmask format (N, S, E, W open sides) that carve_maze and
+convert_level_to_bitmask_maze produce. Output is an int32 array of steps, shaped like
+the maze, with -1 for cells that cannot be reached.
+
+Every BFS layer is expanded in one go. A wide frontier is kept as a boolean array and
+moved with shifted copies of the per-direction passage masks. A narrow one, as in the
+long corridors of perfect mazes, is kept as flat cell indices so a layer costs time in
+proportion to its size rather than to the whole maze.
+"""
+import numpy as np
+from maze_solver.maze_search import N, S, E, W
+
+DENSE_FRACTION = 64  # Frontiers above 1/64 of the cells are expanded as boolean arrays
+
+
+class PassageMasks:
+    """Per-direction boolean masks of a bitmask maze: north[y, x] if (x, y) opens to the north"""
+
+    def __init__(self, maze):
+        cells = np.asarray(maze, dtype=np.uint8)
+        if cells.ndim != 2:
+            raise ValueError("Expected a 2D bitmask maze")
+        self.shape = cells.shape
+        self.rows, self.cols = cells.shape
+        self.north = (cells & N) != 0
+        self.south = (cells & S) != 0
+        self.east = (cells & E) != 0
+        self.west = (cells & W) != 0
+        # Sides open onto the outside of the maze lead nowhere
+        self.north[0, :] = False
+        self.south[-1, :] = False
+        self.east[:, -1] = False
+        self.west[:, 0] = False
+        self._flat = (self.north.ravel(), self.south.ravel(), self.east.ravel(), self.west.ravel())
+
+    def expand_dense(self, frontier):
+        """Boolean array of cells one step from a cell of the boolean array frontier"""
+        reached = np.zeros(self.shape, dtype=bool)
+        reached[:-1, :] |= frontier[1:, :] & self.north[1:, :]
+        reached[1:, :] |= frontier[:-1, :] & self.south[:-1, :]
+        reached[:, 1:] |= frontier[:, :-1] & self.east[:, :-1]
+        reached[:, :-1] |= frontier[:, 1:] & self.west[:, 1:]
+        return reached
+
+    def expand_sparse(self, frontier):
+        """Flat indices (possibly repeated) one step from the flat indices in frontier"""
+        north, south, east, west = self._flat
+        cols = self.cols
+        return np.concatenate((frontier[north[frontier]] - cols, frontier[south[frontier]] + cols,
+                               frontier[east[frontier]] + 1, frontier[west[frontier]] - 1))
+
+
+def multi_source_distance_map(maze, sources, masks=None):
+    """
+    Steps from the nearest of sources, (x, y) cells, to every cell as an int32 array
+    indexed [y, x]; -1 where no source can be reached. masks is an optional PassageMasks
+    of maze to reuse between calls.
+    """
+    masks = masks or PassageMasks(maze)
+    rows, cols = masks.shape
+    distances = np.full(rows * cols, -1, dtype=np.int32)
+
+    frontier = np.unique(np.array([y * cols + x for x, y in sources if 0 <= x < cols and 0 <= y < rows],
+                                  dtype=np.int64))
+    distances[frontier] = 0
+    dense_limit = max(1, rows * cols // DENSE_FRACTION)
+    depth = 0
+    while frontier.size:
+        depth += 1
+        if frontier.size > dense_limit:
+            grid = np.zeros(rows * cols, dtype=bool)
+            grid[frontier] = True
+            reached = masks.expand_dense(grid.reshape(rows, cols)).ravel()
+            reached &= distances < 0
+            frontier = np.flatnonzero(reached)
+        else:
+            reached = masks.expand_sparse(frontier)
+            frontier = np.unique(reached[distances[reached] < 0])
+        distances[frontier] = depth
+    return distances.reshape(rows, cols)
+
+
+def distance_map(maze, start, masks=None):
+    """Steps from start, an (x, y) cell, to every cell; see multi_source_distance_map"""
+    return multi_source_distance_map(maze, [start], masks)
+
+
+def path_from_map(distances, masks, end):
+    """Shortest path to end, as (x, y) cells from a source, by descending a distance map"""
+    x, y = end
+    if distances[y, x] < 0:
+        return []
+    path = [(x, y)]
+    # A neighbour one step closer, reached through a side that opens towards this cell
+    steps = ((0, -1, masks.south), (0, 1, masks.north), (1, 0, masks.west), (-1, 0, masks.east))
+    while distances[y, x] > 0:
+        depth = distances[y, x]
+        for dx, dy, opens_back in steps:
+            nx, ny = x + dx, y + dy
+            if (0 <= nx < masks.cols and 0 <= ny < masks.rows and
+                    distances[ny, nx] == depth - 1 and opens_back[ny, nx]):
+                x, y = nx, ny
+                break
+        path.append((x, y))
+    return path[::-1]
@@ -0,0 +1,343 @@
+"""
+Shared search core for the grid pathfinders in pathfinding_utils.
+
+Tiles are mapped to integer indices of a flat, column-major grid with a one-tile wall
+border, so a neighbour is just index + offset and never needs a bounds check, and
+index order matches (x, y) tuple order. Parents and distances live in preallocated
+arrays instead of dicts keyed by (x, y) tuples.
+Searches expand neighbours in the same order as the original implementations
+(up, down, right, left), so they return exactly the same paths.
+
+Every search takes an optional stats dict and sets its work counters there:
+'expanded' (tiles taken off the frontier and expanded), 'pushed' (tiles put on the
+frontier, the start included) and 'peak_frontier' (largest frontier at any time).
+"""
+import heapq
+import weakref
+from array import array
+
+# Tile code -> 1 if walkable (codes 0-2), for bytes.translate
+WALKABLE = bytes(1 if code <= 2 else 0 for code in range(256))
+
+_grids = weakref.WeakKeyDictionary()  # LevelGraph -> (version, GridIndex)
+
+
+class GridIndex:
+    """Flat, border-padded walkability buffer of a level, stored column by column"""
+
+    def __init__(self, level):
+        self._set_shape(len(level), len(level[0]) if len(level) > 0 else 0)
+
+        border = bytes(self.height)
+        cells = bytearray(border)
+        for column in zip(*[bytes(row).translate(WALKABLE) for row in level]):
+            cells += b'\x00' + bytes(column) + b'\x00'
+        cells += border
+        self.open = cells
+
+    @classmethod
+    def from_buffer(cls, rows, cols, cells):
+        """GridIndex over an existing buffer laid out like .open, e.g. shared memory"""
+        grid = cls.__new__(cls)
+        grid._set_shape(rows, cols)
+        grid.open = cells
+        return grid
+
+    def _set_shape(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.height = rows + 2
+        self.size = self.height * (cols + 2)
+        self.offsets = (-1, 1, self.height, -self.height)  # Up, Down, Right, Left
+
+    def index(self, x, y):
+        return (x + 1) * self.height + y + 1
+
+    def tile(self, index):
+        x, y = divmod(index, self.height)
+        return (x - 1, y - 1)
+
+    def new_parents(self):
+        """Parent buffer with every tile unvisited (-1)"""
+        return array('i', [-1]) * self.size
+
+    def path(self, parent, end):
+        """Walk parent links back from end; the start tile is its own parent"""
+        height = self.height
+        path = []
+        current = end
+        while True:
+            x, y = divmod(current, height)
+            path.append((x - 1, y - 1))
+            previous = parent[current]
+            if previous == current:
+                break
+            current = previous
+        return path[::-1]
+
+
+def grid_for(level):
+    """GridIndex of a level; cached per LevelGraph until its version changes"""
+    version = getattr(level, 'version', None)
+    if version is None:
+        return GridIndex(level)
+
+    cached = _grids.get(level)
+    if cached is None or cached[0] != version:
+        cached = (version, GridIndex(level))
+        _grids[level] = cached
+    return cached[1]
+
+
+def _queue_stats(stats, queue, parent, target):
+    """
+    Work counters of a BFS from its final queue, so the search loop itself stays
+    uncounted. Tile j was queued while its parent was expanded, at which point the
+    tiles after the parent up to j were waiting.
+    """
+    position = {node: i for i, node in enumerate(queue)}
+    peak = 1
+    for j in range(1, len(queue)):
+        waiting = j - position[parent[queue[j]]]
+        if waiting > peak:
+            peak = waiting
+    stats['expanded'] = position[target] + 1 if target in position else len(queue)
+    stats['pushed'] = len(queue)
+    stats['peak_frontier'] = peak
+
+
+def bfs(grid, start, end, stats=None):
+    """Breadth-first search; returns the tile path or [] if end is unreachable"""
+    cells = grid.open
+    offsets = grid.offsets
+    parent = grid.new_parents()
+    source = grid.index(*start)
+    target = grid.index(*end)
+    parent[source] = source
+
+    queue = [source]
+    for current in queue:  # The list grows while it is iterated
+        if current == target:
+            if stats is not None:
+                _queue_stats(stats, queue, parent, target)
+            return grid.path(parent, target)
+        for offset in offsets:
+            neighbor = current + offset
+            if cells[neighbor] and parent[neighbor] < 0:
+                parent[neighbor] = current
+                queue.append(neighbor)
+    if stats is not None:
+        _queue_stats(stats, queue, parent, target)
+    return []
+
+
+def dfs(grid, start, end, stats=None):
+    """Depth-first search; neighbours are pushed in reverse so up is tried first"""
+    cells = grid.open
+    offsets = grid.offsets[::-1]
+    parent = grid.new_parents()
+    source = grid.index(*start)
+    target = grid.index(*end)
+    parent[source] = source
+
+    stack = [source]
+    expanded = 0
+    pushed = peak = 1
+    while stack:
+        current = stack.pop()
+        expanded += 1
+        if current == target:
+            if stats is not None:
+                stats.update(expanded=expanded, pushed=pushed, peak_frontier=peak)
+            return grid.path(parent, target)
+        for offset in offsets:
+            neighbor = current + offset
+            if cells[neighbor] and parent[neighbor] < 0:
+                parent[neighbor] = current
+                stack.append(neighbor)
+                pushed += 1
+        if len(stack) > peak:
+            peak = len(stack)
+    if stats is not None:
+        stats.update(expanded=expanded, pushed=pushed, peak_frontier=peak)
+    return []
+
+
+def dijkstra(grid, start, end, stats=None):
+    """
+    Uniform-cost Dijkstra.
+
+    Heap entries are single ints, cost * size + index. Column-major indices order tiles
+    like the (x, y) tuples the original version pushed, so ties break the same way.
+    """
+    cells = grid.open
+    offsets = grid.offsets
+    size = grid.size
+    parent = grid.new_parents()
+    dist = array('i', [-1]) * size
+    source = grid.index(*start)
+    target = grid.index(*end)
+    parent[source] = source
+    dist[source] = 0
+
+    queue = [source]
+    expanded = 0
+    pushed = peak = 1
+    while queue:
+        cost, current = divmod(heapq.heappop(queue), size)
+
+        if dist[current] < cost:
+            continue  # Stale entry
+        expanded += 1
+        if current == target:
+            if stats is not None:
+                stats.update(expanded=expanded, pushed=pushed, peak_frontier=peak)
+            return grid.path(parent, target)
+
+        new_cost = cost + 1
+        for offset in offsets:
+            neighbor = current + offset
+            if cells[neighbor] and (dist[neighbor] < 0 or new_cost < dist[neighbor]):
+                dist[neighbor] = new_cost
+                parent[neighbor] = current
+                heapq.heappush(queue, new_cost * size + neighbor)
+                pushed += 1
+        if len(queue) > peak:
+            peak = len(queue)
+    if stats is not None:
+        stats.update(expanded=expanded, pushed=pushed, peak_frontier=peak)
+    return []
+
+
+def _expand_layer(cells, offsets, frontier, parent, dist, other_parent, other_dist):
+    """
+    Expand one whole BFS layer of one side. Returns the next layer and the cheapest
+    edge (tile on this side, tile on the other side) joining the two searches, if any.
+    """
+    next_frontier = []
+    meeting = None
+    best = -1
+    for current in frontier:
+        depth = dist[current] + 1
+        for offset in offsets:
+            neighbor = current + offset
+            if not cells[neighbor]:
+                continue
+            if other_parent[neighbor] >= 0:
+                length = depth + other_dist[neighbor]
+                if best < 0 or length < best:
+                    best = length
+                    meeting = (current, neighbor)
+            if parent[neighbor] < 0:
+                parent[neighbor] = current
+                dist[neighbor] = depth
+                next_frontier.append(neighbor)
+    return next_frontier, meeting
+
+
+def bidirectional_bfs(grid, start, end, stats=None):
+    """
+    BFS from both ends at once, always growing the smaller frontier by a whole layer.
+    Stops at the layer where the searches first touch, so each side only explores
+    about half the distance. Returns a shortest path, though ties may resolve
+    differently from bfs().
+    """
+    cells = grid.open
+    offsets = grid.offsets
+    source = grid.index(*start)
+    target = grid.index(*end)
+    if source == target:
+        if stats is not None:
+            stats.update(expanded=0, pushed=1, peak_frontier=1)
+        return [tuple(start)]
+
+    forward, backward = grid.new_parents(), grid.new_parents()
+    forward_dist, backward_dist = array('i', [-1]) * grid.size, array('i', [-1]) * grid.size
+    forward[source], forward_dist[source] = source, 0
+    backward[target], backward_dist[target] = target, 0
+
+    forward_frontier, backward_frontier = [source], [target]
+    expanded = 0
+    pushed = peak = 2
+    path = []
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            expanded += len(forward_frontier)
+            forward_frontier, meeting = _expand_layer(cells, offsets, forward_frontier, forward, forward_dist,
+                                                      backward, backward_dist)
+            pushed += len(forward_frontier)
+            if meeting:
+                near, far = meeting
+                path = grid.path(forward, near) + grid.path(backward, far)[::-1]
+                break
+        else:
+            expanded += len(backward_frontier)
+            backward_frontier, meeting = _expand_layer(cells, offsets, backward_frontier, backward, backward_dist,
+                                                       forward, forward_dist)
+            pushed += len(backward_frontier)
+            if meeting:
+                near, far = meeting
+                path = grid.path(forward, far) + grid.path(backward, near)[::-1]
+                break
+        peak = max(peak, len(forward_frontier) + len(backward_frontier))
+
+    if stats is not None:
+        stats.update(expanded=expanded, pushed=pushed, peak_frontier=peak)
+    return path
+
+
+def dial(grid, start, end, costs, max_cost, stats=None):
+    """
+    Weighted Dijkstra with a bucket queue (Dial's algorithm).
+
+    costs[index] is the cost of entering that tile, a small integer from 1 to max_cost.
+    Tentative distances never run more than max_cost ahead of the one being expanded,
+    so max_cost + 1 buckets used in a ring replace the heap: O(V + E + D) for a path of
+    cost D instead of O(V log V).
+    """
+    cells = grid.open
+    offsets = grid.offsets
+    ring = max_cost + 1
+    parent = grid.new_parents()
+    dist = array('i', [-1]) * grid.size
+    source = grid.index(*start)
+    target = grid.index(*end)
+    parent[source] = source
+    dist[source] = 0
+
+    buckets = [[] for _ in range(ring)]
+    buckets[0].append(source)
+    pending = 1
+    distance = 0
+    expanded = 0
+    pushed = peak = 1
+    while pending:
+        bucket = buckets[distance % ring]
+        while bucket:
+            current = bucket.pop()
+            pending -= 1
+            if dist[current] != distance:
+                continue  # Stale entry, improved since it was queued
+            expanded += 1
+            if current == target:
+                if stats is not None:
+                    stats.update(expanded=expanded, pushed=pushed, peak_frontier=peak)
+                return grid.path(parent, target)
+
+            for offset in offsets:
+                neighbor = current + offset
+                if cells[neighbor]:
+                    new_cost = distance + costs[neighbor]
+                    if dist[neighbor] < 0 or new_cost < dist[neighbor]:
+                        dist[neighbor] = new_cost
+                        parent[neighbor] = current
+                        buckets[new_cost % ring].append(neighbor)
+                        pending += 1
+                        pushed += 1
+            if pending > peak:
+                peak = pending
+        distance += 1
+
+    if stats is not None:
+        stats.update(expanded=expanded, pushed=pushed, peak_frontier=peak)
+    return []
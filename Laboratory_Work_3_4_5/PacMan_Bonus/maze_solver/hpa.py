@@ -0,0 +1,237 @@
+"""
+Hierarchical pathfinding (HPA*) for large tile maps.
+
+The level is cut into square clusters. Wherever a run of open tiles crosses the
+border between two clusters, one entrance (two for long runs) becomes a pair of
+abstract nodes joined by a one-step edge. Inside every cluster the distances
+between its abstract nodes are found once, by a BFS that stays in the cluster.
+
+A query links start and goal to the nodes of their own clusters, runs A* on the
+small abstract graph and only then refines each abstract edge into tiles with a
+search limited to one cluster. Paths are close to shortest, not always shortest.
+"""
+import heapq
+from array import array
+from maze_solver import grid_search
+from maze_solver.pathfinding_utils import check_endpoints
+
+LONG_ENTRANCE = 6  # Runs at least this long get an entrance at each end
+
+
+class HierarchicalGraph:
+    """Clusters, entrances and intra-cluster distances of a level, built once"""
+
+    def __init__(self, level, cluster_size=16):
+        self.grid = grid_search.grid_for(level)
+        self.cluster_size = cluster_size
+        self.cluster_rows = (self.grid.rows + cluster_size - 1) // cluster_size
+        self.edges = {}  # Abstract node (tile index) -> {neighbour node: cost}
+        self.cluster_nodes = {}  # Cluster id -> abstract nodes in it
+
+        self._assign_clusters()
+        self._add_entrances()
+        for cluster, nodes in self.cluster_nodes.items():
+            self._connect_cluster(cluster, nodes)
+
+    def cluster_id(self, x, y):
+        return (x // self.cluster_size) * self.cluster_rows + y // self.cluster_size
+
+    def _assign_clusters(self):
+        """cluster_of[index] is the tile's cluster id, or -1 for walls and the border"""
+        grid = self.grid
+        self.cluster_of = array('i', [-1]) * grid.size
+        cells = grid.open
+        for x in range(grid.cols):
+            for y in range(grid.rows):
+                index = grid.index(x, y)
+                if cells[index]:
+                    self.cluster_of[index] = self.cluster_id(x, y)
+
+    def _add_node(self, index):
+        if index not in self.edges:
+            self.edges[index] = {}
+            self.cluster_nodes.setdefault(self.cluster_of[index], []).append(index)
+
+    def _link(self, a, b, cost):
+        self._add_node(a)
+        self._add_node(b)
+        if cost < self.edges[a].get(b, cost + 1):
+            self.edges[a][b] = cost
+            self.edges[b][a] = cost
+
+    def _add_entrances(self):
+        grid = self.grid
+        size = self.cluster_size
+        # Vertical borders: tile column x on the left, x + 1 on the right
+        for x in range(size - 1, grid.cols - 1, size):
+            self._scan_border([(grid.index(x, y), grid.index(x + 1, y)) for y in range(grid.rows)])
+        # Horizontal borders: tile row y above, y + 1 below
+        for y in range(size - 1, grid.rows - 1, size):
+            self._scan_border([(grid.index(x, y), grid.index(x, y + 1)) for x in range(grid.cols)])
+
+    def _scan_border(self, pairs):
+        """Turn runs of open tile pairs along one border into entrances"""
+        cells = self.grid.open
+        cluster_of = self.cluster_of
+        run = []
+        for a, b in pairs + [(None, None)]:
+            # A run also ends where the clusters along the border change
+            if (a is not None and cells[a] and cells[b] and
+                    (not run or (cluster_of[a] == cluster_of[run[0][0]] and cluster_of[b] == cluster_of[run[0][1]]))):
+                run.append((a, b))
+                continue
+            if run:
+                if len(run) >= LONG_ENTRANCE:
+                    self._link(*run[0], 1)
+                    self._link(*run[-1], 1)
+                else:
+                    self._link(*run[len(run) // 2], 1)
+            run = [(a, b)] if a is not None and cells[a] and cells[b] else []
+
+    def _flood(self, source, cluster):
+        """BFS from source that stays inside one cluster; returns {tile: (distance, parent)}"""
+        cluster_of = self.cluster_of
+        offsets = self.grid.offsets
+        reached = {source: (0, source)}
+        queue = [source]
+        for current in queue:  # The list grows while it is iterated
+            depth = reached[current][0] + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if cluster_of[neighbor] == cluster and neighbor not in reached:
+                    reached[neighbor] = (depth, current)
+                    queue.append(neighbor)
+        return reached
+
+    def _connect_cluster(self, cluster, nodes):
+        """Intra-cluster edges: distances between every pair of the cluster's nodes"""
+        for i, node in enumerate(nodes):
+            reached = self._flood(node, cluster)
+            for other in nodes[i + 1:]:
+                if other in reached:
+                    self._link(node, other, reached[other][0])
+
+    def _local_path(self, source, target, cluster):
+        """Tile indices from source to target without leaving the cluster, or None"""
+        reached = self._flood(source, cluster)
+        if target not in reached:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(reached[path[-1]][1])
+        return path[::-1]
+
+    def find_path(self, start, end, stats=None):
+        """
+        Tile path from start to end, or [] if there is none. If stats is a dict,
+        stats['expanded'] is set to the number of abstract nodes expanded.
+        """
+        grid = self.grid
+        source = grid.index(*start)
+        target = grid.index(*end)
+        source_cluster = self.cluster_of[source]
+        target_cluster = self.cluster_of[target]
+        if stats is not None:
+            stats['expanded'] = 0
+        if source_cluster < 0 or target_cluster < 0:
+            return []
+
+        # Temporary edges from the start and into the goal. In a shared cluster the
+        # direct route inside it competes with routes that leave the cluster
+        start_reached = self._flood(source, source_cluster)
+        start_edges = {node: start_reached[node][0] for node in self.cluster_nodes.get(source_cluster, [])
+                       if node in start_reached}
+        if target in start_reached:
+            start_edges[target] = start_reached[target][0]
+        goal_reached = self._flood(target, target_cluster)
+        goal_edges = {node: goal_reached[node][0] for node in self.cluster_nodes.get(target_cluster, [])
+                      if node in goal_reached}
+
+        abstract = self._abstract_search(source, target, start_edges, goal_edges, stats)
+        if not abstract:
+            return []
+        return self._refine(abstract)
+
+    def _abstract_search(self, source, target, start_edges, goal_edges, stats):
+        """A* over the abstract graph plus the temporary start and goal edges"""
+        height = self.grid.height
+        size = self.grid.size
+        target_x, target_y = divmod(target, height)
+
+        cost = {source: 0}
+        parent = {source: source}
+        closed = set()
+        queue = [source]
+        expanded = 0
+        while queue:
+            node = heapq.heappop(queue) % size
+            if node in closed:
+                continue
+            closed.add(node)
+            expanded += 1
+            if node == target:
+                break
+
+            neighbors = list(self.edges.get(node, {}).items())
+            if node == source:
+                neighbors.extend(start_edges.items())
+            if node in goal_edges:
+                neighbors.append((target, goal_edges[node]))
+
+            for neighbor, step in neighbors:
+                new_cost = cost[node] + step
+                if neighbor not in closed and new_cost < cost.get(neighbor, new_cost + 1):
+                    cost[neighbor] = new_cost
+                    parent[neighbor] = node
+                    x, y = divmod(neighbor, height)
+                    heapq.heappush(queue, (new_cost + abs(x - target_x) + abs(y - target_y)) * size + neighbor)
+
+        if stats is not None:
+            stats['expanded'] = expanded
+        if target not in closed:
+            return []
+        path = [target]
+        while path[-1] != source:
+            path.append(parent[path[-1]])
+        return path[::-1]
+
+    def _refine(self, abstract):
+        """Expand abstract edges into tiles, one cluster-bounded search per edge"""
+        grid = self.grid
+        offsets = grid.offsets
+        path = [abstract[0]]
+        for a, b in zip(abstract, abstract[1:]):
+            if b - a in offsets:  # Entrance crossing or neighbouring tiles
+                path.append(b)
+            else:
+                path.extend(self._local_path(a, b, self.cluster_of[a])[1:])
+        return [grid.tile(index) for index in path]
+
+
+class HierarchicalPlanner:
+    """
+    Path algorithm interface over HierarchicalGraph: builds the abstraction on first
+    use for a level and again only when the level graph's version changes.
+    """
+
+    def __init__(self, cluster_size=16):
+        self.cluster_size = cluster_size
+        self.graph = None
+        self.level = None
+        self.version = None
+
+    def graph_for(self, level):
+        version = getattr(level, 'version', None)
+        if self.graph is None or level is not self.level or version != self.version:
+            self.graph = HierarchicalGraph(level, self.cluster_size)
+            self.level = level
+            self.version = version
+        return self.graph
+
+    def __call__(self, level, start, end, visualize=False):
+        if not check_endpoints(level, start, end):
+            return []
+        path = self.graph_for(level).find_path(start, end)
+        if not path:
+            print("No path found")
+        return path
@@ -0,0 +1,151 @@
+"""
+Jump Point Search for 4-connected, uniform-cost tile maps.
+
+Among equally short paths only the ones that move vertically as early as possible are
+searched, which lets long straight corridors be skipped in a single jump:
+
+- moving horizontally, a tile is a jump point if it is the goal or has a forced
+  neighbour: an open tile above (below) whose counterpart one step back is a wall;
+- moving vertically, a tile is a jump point if it is the goal or a horizontal jump
+  from it (either way) would find a jump point.
+
+A* then only expands jump points. It runs on the flat GridIndex from grid_search.
+"""
+import heapq
+import time
+from array import array
+from maze_solver import grid_search
+from maze_solver.pathfinding_utils import check_endpoints
+from maze_solver.search_stats import finish_stats
+
+
+def _jump_horizontal(cells, node, step, target):
+    """Next jump point from node along step (+/- column height), or -1 at a wall"""
+    while True:
+        node += step
+        if not cells[node]:
+            return -1
+        if node == target:
+            return node
+        if (cells[node - 1] and not cells[node - step - 1]) or (cells[node + 1] and not cells[node - step + 1]):
+            return node
+
+
+def _jump_vertical(cells, node, step, height, target):
+    """Next jump point from node along step (+/- 1), or -1 at a wall"""
+    while True:
+        node += step
+        if not cells[node]:
+            return -1
+        if node == target:
+            return node
+        if ((cells[node + height] and _jump_horizontal(cells, node, height, target) >= 0) or
+                (cells[node - height] and _jump_horizontal(cells, node, -height, target) >= 0)):
+            return node
+
+
+def _directions(cells, node, parent, height):
+    """Steps worth taking from node, given the jump that reached it"""
+    if parent == node:  # Start tile
+        return (-1, 1, height, -height)
+
+    moved = node - parent
+    if moved % height == 0:  # Horizontal: straight on, plus forced turns
+        step = height if moved > 0 else -height
+        directions = [step]
+        if cells[node - 1] and not cells[node - step - 1]:
+            directions.append(-1)
+        if cells[node + 1] and not cells[node - step + 1]:
+            directions.append(1)
+        return directions
+
+    step = 1 if moved > 0 else -1  # Vertical: straight on or either side
+    return (step, height, -height)
+
+
+def jump_point_search(grid, start, end, stats=None):
+    """
+    A* over jump points; returns the full tile path or [] if end is unreachable.
+    If stats is a dict, the grid_search work counters are set there, counting jump points.
+    """
+    cells = grid.open
+    height = grid.height
+    size = grid.size
+    source = grid.index(*start)
+    target = grid.index(*end)
+    target_x, target_y = divmod(target, height)
+
+    parent = grid.new_parents()
+    cost = array('i', [-1]) * size
+    parent[source] = source
+    cost[source] = 0
+    queue = [source]
+    expanded = 0
+    pushed = peak = 1
+
+    while queue:
+        node = heapq.heappop(queue) % size
+        if cost[node] < 0:
+            continue  # Already expanded
+        g = cost[node]
+        cost[node] = -2 - g  # Closed, keeps g recoverable
+        expanded += 1
+
+        if node == target:
+            break
+
+        for step in _directions(cells, node, parent[node], height):
+            if not cells[node + step]:
+                continue
+            if step == 1 or step == -1:
+                jump = _jump_vertical(cells, node, step, height, target)
+            else:
+                jump = _jump_horizontal(cells, node, step, target)
+            if jump < 0:
+                continue
+
+            new_cost = g + abs(jump - node) // (1 if step in (1, -1) else height)
+            known = cost[jump]
+            if known <= -2 or (known >= 0 and known <= new_cost):
+                continue
+            cost[jump] = new_cost
+            parent[jump] = node
+            x, y = divmod(jump, height)
+            heapq.heappush(queue, (new_cost + abs(x - target_x) + abs(y - target_y)) * size + jump)
+            pushed += 1
+        if len(queue) > peak:
+            peak = len(queue)
+    else:
+        if stats is not None:
+            stats.update(expanded=expanded, pushed=pushed, peak_frontier=peak)
+        return []
+
+    if stats is not None:
+        stats.update(expanded=expanded, pushed=pushed, peak_frontier=peak)
+    return _unpack(grid, parent, target)
+
+
+def _unpack(grid, parent, end):
+    """Fill in the straight runs between consecutive jump points"""
+    jump_points = grid.path(parent, end)
+    path = [jump_points[0]]
+    for x, y in jump_points[1:]:
+        px, py = path[-1]
+        dx = (x > px) - (x < px)
+        dy = (y > py) - (y < py)
+        while (px, py) != (x, y):
+            px, py = px + dx, py + dy
+            path.append((px, py))
+    return path
+
+
+def jps_path(level, start, end, visualize=False, stats=None):
+    """Jump Point Search that works with the Pac-Man level format"""
+    started = time.perf_counter()
+    if not check_endpoints(level, start, end):
+        return finish_stats(stats, [], started)
+
+    path = jump_point_search(grid_search.grid_for(level), start, end, stats)
+    if not path:
+        print("No path found")
+    return finish_stats(stats, path, started)
@@ -0,0 +1,108 @@
+"""Navigation graph of a Pac-Man level, built once per level and shared by all ghosts"""
+from collections import deque
+
+N, S, E, W = 1, 2, 4, 8
+
+
+def convert_level_to_bitmask_maze(level):
+    rows, cols = len(level), len(level[0])
+    bitmask_maze = [[0 for _ in range(cols)] for _ in range(rows)]
+
+    for y in range(rows):
+        for x in range(cols):
+            if level[y][x] <= 2:
+                if y > 0 and level[y - 1][x] <= 2:
+                    bitmask_maze[y][x] |= N
+                if y < rows - 1 and level[y + 1][x] <= 2:
+                    bitmask_maze[y][x] |= S
+                if x < cols - 1 and level[y][x + 1] <= 2:
+                    bitmask_maze[y][x] |= E
+                if x > 0 and level[y][x - 1] <= 2:
+                    bitmask_maze[y][x] |= W
+    return bitmask_maze
+
+
+class LevelGraph:
+    """
+    Walkability and neighbour masks of a level.
+
+    The graph also behaves like a read-only level grid (graph[y][x], len(graph)),
+    where open tiles read as 0 and walls keep their tile code, so it can be passed
+    directly to the functions in pathfinding_utils.
+
+    Walls never change during a level, so the graph is built once in initialize_game.
+    Code that edits walls must call invalidate(), which rebuilds the graph and bumps
+    `version` so that anything cached against the old layout can notice.
+    """
+
+    def __init__(self, level):
+        self.level = level
+        self.version = 0
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute walkability and masks from the current level"""
+        level = self.level
+        self.rows = len(level)
+        self.cols = len(level[0]) if self.rows > 0 else 0
+
+        self.walkable = [[cell <= 2 for cell in row] for row in level]
+        self.masks = convert_level_to_bitmask_maze(level)
+        self.tiles = [[0 if cell <= 2 else cell for cell in row] for row in level]
+        self._nearest = None  # Built on first use by nearest_walkable
+        self.version += 1
+
+    def invalidate(self):
+        """Mark the level as edited"""
+        self.rebuild()
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, y):
+        return self.tiles[y]
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def is_walkable(self, x, y):
+        return self.in_bounds(x, y) and self.walkable[y][x]
+
+    def neighbors(self, x, y):
+        """Walkable tiles adjacent to (x, y), in N, S, E, W order"""
+        mask = self.masks[y][x]
+        result = []
+        if mask & N:
+            result.append((x, y - 1))
+        if mask & S:
+            result.append((x, y + 1))
+        if mask & E:
+            result.append((x + 1, y))
+        if mask & W:
+            result.append((x - 1, y))
+        return result
+
+    def nearest_walkable(self, x, y):
+        """
+        Walkable tile closest to (x, y) in grid steps, walls ignored; (x, y) itself if
+        it is walkable. Coordinates off the board are clamped onto it first. None if
+        the level has no walkable tile.
+        """
+        if self._nearest is None:
+            self._nearest = self._build_nearest()
+        x = min(max(x, 0), self.cols - 1)
+        y = min(max(y, 0), self.rows - 1)
+        return self._nearest[y][x] if self.rows and self.cols else None
+
+    def _build_nearest(self):
+        """Nearest walkable tile of every tile, by a BFS seeded with all walkable tiles"""
+        nearest = [[(x, y) if walkable else None for x, walkable in enumerate(row)]
+                   for y, row in enumerate(self.walkable)]
+        queue = deque((x, y) for y in range(self.rows) for x in range(self.cols) if nearest[y][x])
+        while queue:
+            x, y = queue.popleft()
+            for nx, ny in ((x, y - 1), (x, y + 1), (x + 1, y), (x - 1, y)):
+                if self.in_bounds(nx, ny) and nearest[ny][nx] is None:
+                    nearest[ny][nx] = nearest[y][x]
+                    queue.append((nx, ny))
+        return nearest
@@ -0,0 +1,159 @@
+"""
+Headless solvers for cell mazes: the grids the maze makers pickle, where each cell is a
+bitmask of its open sides (N, S, E, W) plus IN once it has been carved.
+
+Every solver runs without pygame at full speed. To watch a search, pass an observer:
+it is called once per expanded cell as observer(current, parent), where parent maps
+each discovered cell to the cell it was reached from (None for the start). With no
+observer the only cost is one `is not None` check per expansion. maze_view draws
+searches this way.
+
+Pac-Man tile maps (walls as tiles rather than cell sides) use grid_search instead.
+"""
+import heapq
+from collections import deque
+
+# Cell bits, as written by the maze makers
+N, S, E, W = 1, 2, 4, 8
+IN = 0x10
+
+STEPS = ((N, 0, -1), (S, 0, 1), (E, 1, 0), (W, -1, 0))  # Neighbour order: N, S, E, W
+OPPOSITE = {N: S, S: N, E: W, W: E}
+
+
+def neighbors(grid, cell):
+    """Cells reachable in one step from cell, through its open sides"""
+    x, y = cell
+    value = grid[y][x]
+    return [(x + dx, y + dy) for side, dx, dy in STEPS if value & side]
+
+
+def corners(grid):
+    """Default start and end: top-left and bottom-right cells"""
+    return (0, 0), (len(grid[0]) - 1, len(grid) - 1)
+
+
+def build_path(parent, end):
+    """Follow parent links back from end; [] if end was never reached"""
+    if end not in parent:
+        return []
+    path = []
+    step = end
+    while step is not None:
+        path.append(step)
+        step = parent[step]
+    return path[::-1]
+
+
+def bfs(grid, start, end, observer=None):
+    """Breadth-first search; returns (path, parent), path being shortest or []"""
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        if observer is not None:
+            observer(current, parent)
+        if current == end:
+            break
+        for neighbor in neighbors(grid, current):
+            if neighbor not in parent:
+                parent[neighbor] = current
+                queue.append(neighbor)
+    return build_path(parent, end), parent
+
+
+def dfs(grid, start, end, observer=None):
+    """Depth-first search, trying N, S, E, W in that order; returns (path, parent)"""
+    parent = {start: None}
+    visited = set()
+    stack = [start]
+    while stack:
+        current = stack.pop()
+        if current in visited:
+            continue
+        visited.add(current)
+        if observer is not None:
+            observer(current, parent)
+        if current == end:
+            break
+        for neighbor in reversed(neighbors(grid, current)):
+            if neighbor not in visited:
+                parent[neighbor] = current
+                stack.append(neighbor)
+    return build_path(parent, end), parent
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def astar(grid, start, end, observer=None, heuristic=manhattan):
+    """A* with unit step costs; returns (path, parent). heuristic(cell, end) must not overestimate"""
+    parent = {start: None}
+    cost = {start: 0}
+    closed = set()
+    queue = [(heuristic(start, end), start)]
+    while queue:
+        current = heapq.heappop(queue)[1]
+        if current in closed:
+            continue
+        closed.add(current)
+        if observer is not None:
+            observer(current, parent)
+        if current == end:
+            break
+        new_cost = cost[current] + 1
+        for neighbor in neighbors(grid, current):
+            if new_cost < cost.get(neighbor, new_cost + 1):
+                cost[neighbor] = new_cost
+                parent[neighbor] = current
+                heapq.heappush(queue, (new_cost + heuristic(neighbor, end), neighbor))
+    return build_path(parent, end), parent
+
+
+def dijkstra(grid, start, end, observer=None):
+    """Dijkstra's algorithm with unit step costs; returns (path, parent)"""
+    return astar(grid, start, end, observer, heuristic=lambda cell, goal: 0)
+
+
+def dead_end_filling(grid, start, end, observer=None):
+    """
+    Fill dead ends (cells with one open side, other than start and end) until none are
+    left, then walk what remains. The grid is not modified. Returns (path, filled), filled
+    being the set of filled cells; the observer is called as observer(cell, filled).
+    """
+    cells = [row[:] for row in grid]
+    rows, cols = len(cells), len(cells[0]) if cells else 0
+    filled = set()
+
+    def is_dead_end(cell):
+        return cell not in (start, end) and len(neighbors(cells, cell)) == 1
+
+    pending = deque((x, y) for y in range(rows) for x in range(cols) if is_dead_end((x, y)))
+    while pending:
+        cell = pending.popleft()
+        if cell in filled or not is_dead_end(cell):
+            continue
+        x, y = cell
+        (nx, ny), = neighbors(cells, cell)
+        for side, dx, dy in STEPS:
+            if (dx, dy) == (nx - x, ny - y):
+                cells[ny][nx] &= ~OPPOSITE[side]
+        cells[y][x] = 0
+        filled.add(cell)
+        if observer is not None:
+            observer(cell, filled)
+        if is_dead_end((nx, ny)):
+            pending.append((nx, ny))
+
+    path, _ = bfs(cells, start, end)
+    return path, filled
+
+
+SOLVERS = {
+    'bfs': bfs,
+    'dfs': dfs,
+    'dijkstra': dijkstra,
+    'astar': astar,
+    'dead_end_filling': dead_end_filling,
+}
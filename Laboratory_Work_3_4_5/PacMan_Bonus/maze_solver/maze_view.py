@@ -0,0 +1,116 @@
+"""
+Pygame viewer for the cell maze solvers in maze_search.
+
+MazeView draws a maze and, as a maze_search observer, redraws it after every step of
+a search. The per-algorithm scripts (bfs.py, dfs.py, ...) are thin wrappers around run().
+"""
+import pickle
+import sys
+import pygame
+from maze_solver import maze_search
+from maze_solver.maze_search import N, S, E, W, IN
+
+# Constants for the display
+WIDTH, HEIGHT = 800, 800
+STEP_DELAY = 50  # Milliseconds between drawn search steps
+
+# Colors
+BLACK = (0, 0, 0)
+GREEN = (0, 255, 0)
+DARK_GREY = (75, 75, 75)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+def load_maze(filename):
+    with open(filename, 'rb') as f:
+        return pickle.load(f)
+
+
+class MazeView:
+    def __init__(self, grid, caption="Maze Solver", delay=STEP_DELAY):
+        self.grid = grid
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if self.rows > 0 else 0
+        self.cell_width = WIDTH // self.cols
+        self.cell_height = HEIGHT // self.rows
+        self.delay = delay
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption(caption)
+
+    def center(self, cell):
+        x, y = cell
+        return (x * self.cell_width + self.cell_width // 2, y * self.cell_height + self.cell_height // 2)
+
+    def draw_maze(self, path=None, current=None, parent=None, filled=None):
+        self.screen.fill(BLACK)
+        for y, row in enumerate(self.grid):
+            for x, cell in enumerate(row):
+                cell_x, cell_y = x * self.cell_width, y * self.cell_height
+                color = DARK_GREY
+                if cell & IN:
+                    color = BLACK
+                if filled and (x, y) in filled:
+                    color = GREEN
+                pygame.draw.rect(self.screen, color, (cell_x, cell_y, self.cell_width, self.cell_height))
+
+                right, bottom = cell_x + self.cell_width, cell_y + self.cell_height
+                if cell & S == 0:
+                    pygame.draw.line(self.screen, GREEN, (cell_x, bottom), (right, bottom), 3)
+                if cell & E == 0:
+                    pygame.draw.line(self.screen, GREEN, (right, cell_y), (right, bottom), 3)
+                if filled is not None:  # Dead-end filling also outlines the top and left sides
+                    if cell & N == 0:
+                        pygame.draw.line(self.screen, GREEN, (cell_x, cell_y), (right, cell_y), 3)
+                    if cell & W == 0:
+                        pygame.draw.line(self.screen, GREEN, (cell_x, cell_y), (cell_x, bottom), 3)
+
+        if parent:
+            for node, previous in parent.items():
+                if previous is not None:
+                    pygame.draw.line(self.screen, BLUE, self.center(node), self.center(previous), 2)
+
+        if path:
+            for i in range(1, len(path)):
+                pygame.draw.line(self.screen, RED, self.center(path[i - 1]), self.center(path[i]), 3)
+
+        if current:
+            pygame.draw.circle(self.screen, RED, self.center(current), 5)
+
+        pygame.display.flip()
+
+    def observe_search(self, current, parent):
+        """maze_search observer for bfs, dfs, dijkstra and astar"""
+        self.draw_maze(current=current, parent=parent)
+        pygame.time.wait(self.delay)
+
+    def observe_filling(self, cell, filled):
+        """maze_search observer for dead_end_filling"""
+        self.draw_maze(filled=filled)
+        pygame.time.wait(self.delay)
+
+    def wait_for_quit(self):
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+        pygame.quit()
+
+
+def run(algorithm, caption, filename):
+    """Solve the pickled maze corner to corner with one algorithm, drawing every step"""
+    if len(sys.argv) > 1:  # Optional maze file on the command line
+        filename = sys.argv[1]
+    pygame.init()
+    view = MazeView(load_maze(filename), caption)
+    start, end = maze_search.corners(view.grid)
+
+    if algorithm == 'dead_end_filling':
+        view.draw_maze(filled=set())
+        path, filled = maze_search.dead_end_filling(view.grid, start, end, view.observe_filling)
+        view.draw_maze(path=path, filled=filled)
+    else:
+        path, parent = maze_search.SOLVERS[algorithm](view.grid, start, end, view.observe_search)
+        view.draw_maze(path=path, parent=parent)
+    view.wait_for_quit()
@@ -0,0 +1,178 @@
+"""
+All-pairs next-hop and distance tables for a fixed level.
+
+A BFS is run from every walkable tile once, offline, and the results are stored as
+flat uint8 (next hop) and uint16 (distance) arrays. A path query is then a walk
+along the table, O(path length), with no search at all.
+
+Tables are cached on disk under a hash of the level's walkable tiles. To precompute
+the table for the original board, run from the PacMan_Bonus directory:
+
+    python -m maze_solver.next_hop_table
+"""
+import copy
+import hashlib
+import os
+import pickle
+import time
+from array import array
+from collections import deque
+from maze_solver.level_graph import LevelGraph
+from maze_solver.search_stats import finish_stats
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+# Hop codes index into this list: Up, Down, Right, Left
+DIRECTIONS = [(0, -1), (0, 1), (1, 0), (-1, 0)]
+NO_HOP = 255
+UNREACHABLE = 0xFFFF
+
+_loaded = {}  # Level hash -> NextHopTable, so a table is read from disk once per process
+
+
+def level_hash(level):
+    """Hash of a level's size and walkable tiles (pellets do not change it)"""
+    graph = level if isinstance(level, LevelGraph) else LevelGraph(level)
+    digest = hashlib.sha1(f"{graph.rows}x{graph.cols}".encode())
+    for row in graph.walkable:
+        digest.update(bytes(row))
+    return digest.hexdigest()
+
+
+class NextHopTable:
+    """
+    Next-hop and distance matrices over the walkable tiles of one level.
+
+    next_hop[i * n + j] is the DIRECTIONS index of the first step from tile i towards
+    tile j, and distance[i * n + j] is the number of steps between them. Tiles are
+    numbered in row-major order of the level.
+
+    The table is callable like the other path functions: table(level, start, end).
+    """
+
+    def __init__(self, cols, rows, tiles, next_hop, distance):
+        self.cols = cols
+        self.rows = rows
+        self.tiles = tiles  # Walkable tiles as (x, y), in row-major order
+        self.index = {tile: i for i, tile in enumerate(tiles)}
+        self.next_hop = next_hop
+        self.distance = distance
+
+    @classmethod
+    def build(cls, level):
+        """Run a BFS from every walkable tile of level"""
+        graph = level if isinstance(level, LevelGraph) else LevelGraph(level)
+        tiles = [(x, y) for y in range(graph.rows) for x in range(graph.cols) if graph.walkable[y][x]]
+        index = {tile: i for i, tile in enumerate(tiles)}
+        n = len(tiles)
+
+        # Neighbour indices with the hop code leading to them
+        adjacency = []
+        for x, y in tiles:
+            links = []
+            for code, (dx, dy) in enumerate(DIRECTIONS):
+                neighbor = index.get((x + dx, y + dy))
+                if neighbor is not None:
+                    links.append((neighbor, code))
+            adjacency.append(links)
+
+        next_hop = bytearray([NO_HOP]) * (n * n)
+        distance = array('H', [UNREACHABLE]) * (n * n)
+
+        # A BFS from the target j leaves every reached tile pointing one step towards j
+        opposite = [1, 0, 3, 2]
+        for j in range(n):
+            distance[j * n + j] = 0
+            queue = deque([j])
+            while queue:
+                current = queue.popleft()
+                depth = distance[current * n + j] + 1
+                for neighbor, code in adjacency[current]:
+                    if distance[neighbor * n + j] == UNREACHABLE:
+                        distance[neighbor * n + j] = depth
+                        next_hop[neighbor * n + j] = opposite[code]
+                        queue.append(neighbor)
+
+        return cls(graph.cols, graph.rows, tiles, next_hop, distance)
+
+    @classmethod
+    def load_or_build(cls, level, cache_dir=CACHE_DIR):
+        """Return the table for level, building and caching it on disk if needed"""
+        key = level_hash(level)
+        if key in _loaded:
+            return _loaded[key]
+
+        path = os.path.join(cache_dir, f"next_hop_{key}.pkl")
+        if os.path.exists(path):
+            table = cls.load(path)
+        else:
+            table = cls.build(level)
+            table.save(path)
+
+        _loaded[key] = table
+        return table
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump({
+                'cols': self.cols,
+                'rows': self.rows,
+                'tiles': array('H', [y * self.cols + x for x, y in self.tiles]),
+                'next_hop': bytes(self.next_hop),
+                'distance': self.distance,
+            }, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        cols = data['cols']
+        tiles = [(i % cols, i // cols) for i in data['tiles']]
+        return cls(cols, data['rows'], tiles, data['next_hop'], data['distance'])
+
+    def distance_between(self, start, end):
+        """Number of steps from start to end, or None if either is not walkable or unreachable"""
+        i, j = self.index.get(start), self.index.get(end)
+        if i is None or j is None:
+            return None
+        steps = self.distance[i * len(self.tiles) + j]
+        return None if steps == UNREACHABLE else steps
+
+    def __call__(self, level, start, end, visualize=False, stats=None):
+        """
+        Shortest path from start to end read from the table, in the format of bfs_path.
+        There is no frontier: stats counts every tile of the walk as expanded.
+        """
+        started = time.perf_counter()
+        i, j = self.index.get(start), self.index.get(end)
+        if i is None or j is None:
+            print(f"Start or end is not a walkable tile: {start}, {end}")
+            return finish_stats(stats, [], started)
+
+        n = len(self.tiles)
+        if self.next_hop[i * n + j] == NO_HOP and i != j:
+            print("No path found")
+            return finish_stats(stats, [], started)
+
+        path = [start]
+        x, y = start
+        while i != j:
+            dx, dy = DIRECTIONS[self.next_hop[i * n + j]]
+            x, y = x + dx, y + dy
+            path.append((x, y))
+            i = self.index[(x, y)]
+        if stats is not None:
+            stats['expanded'] = len(path)
+        return finish_stats(stats, path, started)
+
+
+if __name__ == "__main__":
+    from board import boards
+    from setup.level_loader import open_ghost_box
+
+    level = open_ghost_box(copy.deepcopy(boards))
+    table = NextHopTable.build(level)
+    path = os.path.join(CACHE_DIR, f"next_hop_{level_hash(level)}.pkl")
+    table.save(path)
+    print(f"Next-hop table for {len(table.tiles)} walkable tiles saved to {path}")
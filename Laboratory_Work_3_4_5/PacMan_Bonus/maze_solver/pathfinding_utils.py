@@ -1,6 +1,10 @@
 import pygame
 import heapq
-from collections import deque
+import time
+from collections import deque, OrderedDict
+from maze_solver.level_graph import LevelGraph
+from maze_solver import grid_search
+from maze_solver.search_stats import finish_stats
 
 # Constants (reuse your config in future for integration)
 WIDTH, HEIGHT = 600, 600
@@ -67,121 +71,190 @@ def construct_path(parent, end):
         step = parent[step]
     return path[::-1]
 
-def bfs_path(level, start, end, visualize=False):
-    """Modified BFS that works with the Pac-Man level format"""
-    from collections import deque
-
+def check_endpoints(level, start, end):
+    """Report and reject start/end tiles that are off the level or inside a wall"""
     # Check for valid inputs
     if not (0 <= start[0] < len(level[0]) and 0 <= start[1] < len(level) and
             0 <= end[0] < len(level[0]) and 0 <= end[1] < len(level)):
         print(f"Invalid start or end position: {start}, {end}")
-        return []
+        return False
 
     # Check if start or end is in a wall
     if level[start[1]][start[0]] > 2 or level[end[1]][end[0]] > 2:
         print(f"Start or end is in a wall: start={level[start[1]][start[0]]}, end={level[end[1]][end[0]]}")
-        return []
+        return False
+    return True
 
-    queue = deque([start])
-    visited = {start: None}  # Maps positions to their parent
 
-    while queue:
-        current = queue.popleft()
+def bfs_path(level, start, end, visualize=False, stats=None):
+    """
+    Modified BFS that works with the Pac-Man level format.
+    Like the other *_path functions, fills stats (a dict) as described in search_stats.
+    """
+    started = time.perf_counter()
+    if not check_endpoints(level, start, end):
+        return finish_stats(stats, [], started)
 
-        if current == end:
-            # Reconstruct path
-            path = []
-            while current:
-                path.append(current)
-                current = visited[current]
-            return path[::-1]  # Reverse to get start-to-end
+    path = grid_search.bfs(grid_search.grid_for(level), start, end, stats)
+    if not path:
+        print("No path found")
+    return finish_stats(stats, path, started)
 
-        # Try all four directions
-        directions = [(0, -1), (0, 1), (1, 0), (-1, 0)]  # Up, Down, Right, Left
-        for dx, dy in directions:
-            nx, ny = current[0] + dx, current[1] + dy
-            neighbor = (nx, ny)
 
-            # Check if valid and not visited
-            if (0 <= nx < len(level[0]) and 0 <= ny < len(level) and
-                    level[ny][nx] <= 2 and neighbor not in visited):
-                queue.append(neighbor)
-                visited[neighbor] = current
+def bidirectional_bfs_path(level, start, end, visualize=False, stats=None):
+    """BFS from both ends that meets in the middle; same return format as bfs_path"""
+    started = time.perf_counter()
+    if not check_endpoints(level, start, end):
+        return finish_stats(stats, [], started)
 
-    print("No path found")
-    return []  # No path found
+    path = grid_search.bidirectional_bfs(grid_search.grid_for(level), start, end, stats)
+    if not path:
+        print("No path found")
+    return finish_stats(stats, path, started)
 
 
-def dfs_path(level, start, end, visualize=False):
+def dfs_path(level, start, end, visualize=False, stats=None):
     """Modified DFS that works with the Pac-Man level format"""
-    # Check for valid inputs
-    if not (0 <= start[0] < len(level[0]) and 0 <= start[1] < len(level) and
-            0 <= end[0] < len(level[0]) and 0 <= end[1] < len(level)):
-        print(f"Invalid start or end position: {start}, {end}")
-        return []
-
-    # Check if start or end is in a wall
-    if level[start[1]][start[0]] > 2 or level[end[1]][end[0]] > 2:
-        print(f"Start or end is in a wall: start={level[start[1]][start[0]]}, end={level[end[1]][end[0]]}")
-        return []
-
-    stack = [start]
-    visited = {start: None}  # Maps positions to their parent
-
-    while stack:
-        current = stack.pop()
-
-        if current == end:
-            # Reconstruct path
-            path = []
-            while current:
-                path.append(current)
-                current = visited[current]
-            return path[::-1]  # Reverse to get start-to-end
-
-        # Try all four directions
-        directions = [(0, -1), (0, 1), (1, 0), (-1, 0)]  # Up, Down, Right, Left
-        # Reverse order for DFS to prefer right and down movements
-        for dx, dy in reversed(directions):
-            nx, ny = current[0] + dx, current[1] + dy
-            neighbor = (nx, ny)
-
-            # Check if valid and not visited
-            if (0 <= nx < len(level[0]) and 0 <= ny < len(level) and
-                    level[ny][nx] <= 2 and neighbor not in visited):
-                stack.append(neighbor)
-                visited[neighbor] = current
+    started = time.perf_counter()
+    if not check_endpoints(level, start, end):
+        return finish_stats(stats, [], started)
 
-    print("No path found")
-    return []  # No path found
+    path = grid_search.dfs(grid_search.grid_for(level), start, end, stats)
+    if not path:
+        print("No path found")
+    return finish_stats(stats, path, started)
 
 
-def dijkstra_path(level, start, end, visualize=False):
+def dijkstra_path(level, start, end, visualize=False, stats=None):
     """Modified Dijkstra that works with the Pac-Man level format"""
-    import heapq
-
-    # Check for valid inputs
-    if not (0 <= start[0] < len(level[0]) and 0 <= start[1] < len(level) and
-            0 <= end[0] < len(level[0]) and 0 <= end[1] < len(level)):
-        print(f"Invalid start or end position: {start}, {end}")
-        return []
-
-    # Check if start or end is in a wall
-    if level[start[1]][start[0]] > 2 or level[end[1]][end[0]] > 2:
-        print(f"Start or end is in a wall: start={level[start[1]][start[0]]}, end={level[end[1]][end[0]]}")
-        return []
-
-    # Priority queue with (cost, position)
-    queue = [(0, start)]
-    visited = {}  # Maps positions to (cost, parent)
-    visited[start] = (0, None)
-
+    started = time.perf_counter()
+    if not check_endpoints(level, start, end):
+        return finish_stats(stats, [], started)
+
+    path = grid_search.dijkstra(grid_search.grid_for(level), start, end, stats)
+    if not path:
+        print("No path found")
+    return finish_stats(stats, path, started)
+
+
+def weighted_dijkstra_path(level, start, end, visualize=False, costs=None, stats=None):
+    """
+    Dijkstra over per-tile entry costs (a CostMap), using a bucket queue.
+    Without costs every tile costs 1 and this finds the same path lengths as BFS.
+    """
+    started = time.perf_counter()
+    if not check_endpoints(level, start, end):
+        return finish_stats(stats, [], started)
+
+    grid = grid_search.grid_for(level)
+    if costs is None:
+        path = grid_search.dial(grid, start, end, bytes([1]) * grid.size, 1, stats)
+    else:
+        if costs.grid is not grid:  # Level changed under the cost map
+            costs.attach(grid)
+        path = grid_search.dial(grid, start, end, costs.costs, costs.max_cost, stats)
+    if not path:
+        print("No path found")
+    return finish_stats(stats, path, started)
+
+
+# Admissible heuristics for astar_path on the 4-connected grid
+def manhattan_distance(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def octile_distance(a, b):
+    """Never more than the Manhattan distance, so also admissible without diagonal moves"""
+    dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dx, dy) + (2 ** 0.5 - 1) * min(dx, dy)
+
+
+def grid_distances(level, source):
+    """BFS step counts from source to every reachable walkable tile"""
+    distances = {source: 0}
+    queue = deque([source])
+    rows, cols = len(level), len(level[0])
     while queue:
-        cost, current = heapq.heappop(queue)
+        x, y = queue.popleft()
+        for dx, dy in [(0, -1), (0, 1), (1, 0), (-1, 0)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < cols and 0 <= ny < rows and level[ny][nx] <= 2 and (nx, ny) not in distances:
+                distances[(nx, ny)] = distances[(x, y)] + 1
+                queue.append((nx, ny))
+    return distances
+
+
+class LandmarkHeuristic:
+    """
+    ALT heuristic: exact distances from a few landmark tiles, precomputed once per level.
+
+    By the triangle inequality |d(L, a) - d(L, b)| <= d(a, b) for every landmark L, so the
+    largest such difference is admissible and much tighter than Manhattan around walls.
+    Landmarks are picked far apart (each one the farthest tile from those already chosen).
+    """
+
+    def __init__(self, level, count=4, landmarks=None):
+        if landmarks is None:
+            landmarks = self.pick_landmarks(level, count)
+        self.landmarks = list(landmarks)
+        self.distances = [grid_distances(level, landmark) for landmark in self.landmarks]
+
+    @staticmethod
+    def pick_landmarks(level, count):
+        first = next(((x, y) for y, row in enumerate(level) for x, tile in enumerate(row) if tile <= 2), None)
+        if first is None:
+            return []
+        landmarks = []
+        closest = grid_distances(level, first)  # Distance to the nearest chosen landmark
+        for _ in range(count):
+            landmark = max(closest, key=closest.get)
+            if landmark in landmarks:
+                break
+            landmarks.append(landmark)
+            for tile, distance in grid_distances(level, landmark).items():
+                closest[tile] = min(closest[tile], distance)
+        return landmarks
+
+    def __call__(self, a, b):
+        best = manhattan_distance(a, b)
+        for distances in self.distances:
+            if a in distances and b in distances:
+                best = max(best, abs(distances[a] - distances[b]))
+        return best
+
+
+HEURISTICS = {
+    'manhattan': manhattan_distance,
+    'octile': octile_distance,
+}
+
+
+def astar_path(level, start, end, visualize=False, heuristic=manhattan_distance, stats=None):
+    """
+    A* that works with the Pac-Man level format.
+
+    heuristic is a callable h(tile, goal) or a name from HEURISTICS; pass a
+    LandmarkHeuristic built for the same level to use landmarks.
+    """
+    if isinstance(heuristic, str):
+        heuristic = HEURISTICS[heuristic]
+
+    started = time.perf_counter()
+    if not check_endpoints(level, start, end):
+        return finish_stats(stats, [], started)
+
+    # Priority queue with (f, h, position); ties go to the node closer to the goal
+    h = heuristic(start, end)
+    queue = [(h, h, start)]
+    visited = {start: (0, None)}  # Maps positions to (cost, parent)
+    closed = set()
+    pushed = peak = 1
 
-        # Check if we've already found a better path
-        if current in visited and visited[current][0] < cost:
+    while queue:
+        _, _, current = heapq.heappop(queue)
+        if current in closed:
             continue
+        closed.add(current)
 
         if current == end:
             # Reconstruct path
@@ -189,23 +262,274 @@ def dijkstra_path(level, start, end, visualize=False):
             while current:
                 path.append(current)
                 current = visited[current][1]  # Get parent
-            return path[::-1]  # Reverse to get start-to-end
+            if stats is not None:
+                stats.update(expanded=len(closed), pushed=pushed, peak_frontier=peak)
+            return finish_stats(stats, path[::-1], started)  # Reverse to get start-to-end
 
-        # Try all four directions
+        new_cost = visited[current][0] + 1
         directions = [(0, -1), (0, 1), (1, 0), (-1, 0)]  # Up, Down, Right, Left
         for dx, dy in directions:
             nx, ny = current[0] + dx, current[1] + dy
             neighbor = (nx, ny)
 
-            # Check if valid
-            if (0 <= nx < len(level[0]) and 0 <= ny < len(level) and level[ny][nx] <= 2):
-                # We'll use uniform cost for simplicity
-                new_cost = cost + 1
-
-                # If we haven't visited this node or found a better path
-                if neighbor not in visited or new_cost < visited[neighbor][0]:
-                    visited[neighbor] = (new_cost, current)
-                    heapq.heappush(queue, (new_cost, neighbor))
+            if (0 <= nx < len(level[0]) and 0 <= ny < len(level) and level[ny][nx] <= 2 and
+                    (neighbor not in visited or new_cost < visited[neighbor][0])):
+                visited[neighbor] = (new_cost, current)
+                h = heuristic(neighbor, end)
+                heapq.heappush(queue, (new_cost + h, h, neighbor))
+                pushed += 1
+        if len(queue) > peak:
+            peak = len(queue)
 
     print("No path found")
-    return []  # No path found
\ No newline at end of file
+    if stats is not None:
+        stats.update(expanded=len(closed), pushed=pushed, peak_frontier=peak)
+    return finish_stats(stats, [], started)  # No path found
+
+
+class PathCache:
+    """
+    Bounded LRU cache of paths, shared by all ghosts and placed in front of any path
+    algorithm with wrap().
+
+    Entries are keyed by (start, goal, algorithm name, level version). Only levels
+    with a version stamp (LevelGraph) are cached; when a different level or a new
+    version comes in, the cache empties itself. Cached paths are shared between
+    callers and must not be modified.
+    """
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.level = None
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.uncached = 0  # Calls on levels without a version stamp
+
+    def wrap(self, algorithm, name=None, stamp=None):
+        """
+        Path algorithm with the usual signature that goes through this cache.
+        stamp() is added to the key for algorithms that depend on more than the level,
+        e.g. the version of a cost map.
+        """
+        if name is None:
+            name = getattr(algorithm, '__name__', type(algorithm).__name__)
+
+        def cached_algorithm(level, start, end, visualize=False):
+            key_name = name if stamp is None else (name, stamp())
+            return self.lookup(algorithm, key_name, level, start, end)
+        return cached_algorithm
+
+    def lookup(self, algorithm, name, level, start, end):
+        version = getattr(level, 'version', None)
+        if version is None:
+            self.uncached += 1
+            return algorithm(level, start, end, visualize=False)
+
+        if level is not self.level or version != self.version:
+            if self.entries:
+                self.invalidations += 1
+            self.entries.clear()
+            self.level = level
+            self.version = version
+
+        key = (tuple(start), tuple(end), name, version)
+        path = self.entries.get(key)
+        if path is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return path
+
+        self.misses += 1
+        path = algorithm(level, start, end, visualize=False)
+        self.entries[key] = path
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return path
+
+    def clear(self):
+        self.entries.clear()
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'uncached': self.uncached,
+            'size': len(self.entries),
+            'hit_rate': self.hit_rate(),
+        }
+
+
+class DStarLitePlanner:
+    """
+    Incremental D* Lite planner that keeps its search state between calls.
+
+    Call it like the other path functions: planner(level, start, end). The search runs
+    backwards from the target, so a ghost moving along its path only shifts the key
+    modifier. A moving target is handled as an edge-cost change: the old target tile
+    loses its zero-cost link to a virtual goal and the new one gains it, and only the
+    affected part of the previous search is repaired.
+
+    Each ghost needs its own instance. The state is reset when the level graph changes.
+    """
+
+    def __init__(self):
+        self.graph = None
+        self.version = None
+        self.goal = None
+        self.last_start = None
+        self.km = 0
+        self.g = {}
+        self.rhs = {}
+        self.open = {}  # Node -> key currently valid in the heap
+        self.heap = []
+        self.path = []
+        self.path_index = {}
+        self.pushed = 0  # Heap pushes over the planner's lifetime
+
+    def __call__(self, level, start, end, visualize=False, stats=None):
+        started = time.perf_counter()
+        graph = self._graph_for(level)
+
+        # Check for valid inputs
+        if not (graph.in_bounds(*start) and graph.in_bounds(*end)):
+            print(f"Invalid start or end position: {start}, {end}")
+            return finish_stats(stats, [], started)
+
+        # Check if start or end is in a wall
+        if graph[start[1]][start[0]] > 2 or graph[end[1]][end[0]] > 2:
+            print(f"Start or end is in a wall: start={graph[start[1]][start[0]]}, end={graph[end[1]][end[0]]}")
+            return finish_stats(stats, [], started)
+
+        pushed = self.pushed
+
+        if graph is not self.graph or graph.version != self.version:
+            self.reset(graph, start, end)
+        else:
+            if start != self.last_start:
+                self.km += self.heuristic(self.last_start, start)
+                self.last_start = start
+            if end != self.goal:
+                old_goal, self.goal = self.goal, end
+                self.path, self.path_index = [], {}
+                self.update_vertex(old_goal)
+                self.update_vertex(end)
+
+        expanded, peak = self.compute_shortest_path(start)
+        if stats is not None:
+            stats.update(expanded=expanded, pushed=self.pushed - pushed, peak_frontier=peak)
+
+        # g-values only depend on the goal, so any suffix of the last path is still optimal
+        if start in self.path_index:
+            return finish_stats(stats, self.path[self.path_index[start]:], started)
+
+        self.path = self.extract_path(start)
+        self.path_index = {node: i for i, node in enumerate(self.path)}
+        return finish_stats(stats, self.path, started)
+
+    def _graph_for(self, level):
+        if isinstance(level, LevelGraph):
+            return level
+        if self.graph is None or self.graph.level is not level:
+            return LevelGraph(level)
+        return self.graph
+
+    def reset(self, graph, start, end):
+        """Drop all search state and start a fresh search towards end"""
+        self.graph = graph
+        self.version = graph.version
+        self.goal = end
+        self.last_start = start
+        self.km = 0
+        self.g = {}
+        self.rhs = {end: 0}
+        self.open = {}
+        self.heap = []
+        self.path = []
+        self.path_index = {}
+        self.push(end)
+
+    @staticmethod
+    def heuristic(a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def calculate_key(self, node):
+        best = min(self.g.get(node, float('inf')), self.rhs.get(node, float('inf')))
+        return (best + self.heuristic(self.last_start, node) + self.km, best)
+
+    def push(self, node):
+        key = self.calculate_key(node)
+        self.open[node] = key
+        heapq.heappush(self.heap, (key, node))
+        self.pushed += 1
+
+    def top_key(self):
+        # Skip heap entries made stale by a later push or removal
+        while self.heap:
+            key, node = self.heap[0]
+            if self.open.get(node) == key:
+                return key
+            heapq.heappop(self.heap)
+        return (float('inf'), float('inf'))
+
+    def update_vertex(self, node):
+        if node == self.goal:
+            self.rhs[node] = 0
+        else:
+            self.rhs[node] = min((self.g.get(n, float('inf')) + 1 for n in self.graph.neighbors(*node)),
+                                 default=float('inf'))
+        self.open.pop(node, None)
+        if self.g.get(node, float('inf')) != self.rhs.get(node, float('inf')):
+            self.push(node)
+
+    def compute_shortest_path(self, start):
+        """Repair g-values until start is consistent; returns (nodes expanded, peak heap size)"""
+        g, rhs = self.g, self.rhs
+        inf = float('inf')
+        expanded = 0
+        peak = len(self.heap)
+
+        while (self.top_key() < self.calculate_key(start) or
+               rhs.get(start, inf) != g.get(start, inf)):
+            peak = max(peak, len(self.heap))
+            k_old, node = heapq.heappop(self.heap)
+            del self.open[node]
+            expanded += 1
+            k_new = self.calculate_key(node)
+
+            if k_old < k_new:
+                self.push(node)
+            elif g.get(node, inf) > rhs.get(node, inf):
+                g[node] = rhs[node]
+                for neighbor in self.graph.neighbors(*node):
+                    self.update_vertex(neighbor)
+            else:
+                g[node] = inf
+                self.update_vertex(node)
+                for neighbor in self.graph.neighbors(*node):
+                    self.update_vertex(neighbor)
+        return expanded, peak
+
+    def extract_path(self, start):
+        """Follow decreasing g-values from start to the goal"""
+        inf = float('inf')
+        if self.g.get(start, inf) == inf:
+            print("No path found")
+            return []
+
+        path = [start]
+        current = start
+        while current != self.goal and len(path) <= self.graph.rows * self.graph.cols:
+            current = min(self.graph.neighbors(*current), key=lambda n: self.g.get(n, inf))
+            path.append(current)
+        return path
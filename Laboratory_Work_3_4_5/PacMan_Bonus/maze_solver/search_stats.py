@@ -0,0 +1,120 @@
+"""
+Search instrumentation: per-search stats records and a session-wide aggregator.
+
+A path function that supports it takes stats=<dict> and fills in:
+
+    expanded       tiles (or jump points) taken off the frontier and expanded
+    pushed         tiles put on the frontier, the start included
+    peak_frontier  largest frontier at any time
+    path_length    tiles in the returned path, 0 if there is none
+    seconds        wall-clock time of the call
+
+SearchRecorder wraps the ghosts' path algorithms and sums these per ghost and per
+algorithm over a session, for comparing algorithms on real gameplay.
+"""
+import csv
+import inspect
+import time
+
+WORK_COUNTERS = ('expanded', 'pushed', 'peak_frontier')
+
+
+def finish_stats(stats, path, started):
+    """Complete a stats record (if any) for a search that began at started; returns path"""
+    if stats is not None:
+        stats['seconds'] = time.perf_counter() - started
+        stats['path_length'] = len(path)
+        for counter in WORK_COUNTERS:
+            stats.setdefault(counter, 0)  # Rejected endpoints never reach the search
+    return path
+
+
+def accepts_stats(algorithm):
+    """Whether algorithm can be called with stats=..."""
+    try:
+        return 'stats' in inspect.signature(algorithm).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class SearchRecorder:
+    """
+    Totals of search stats per (ghost, algorithm) over a game session.
+
+    Algorithms without stats support are still timed and their paths measured; their
+    work counters are simply missing (None) in rows().
+    """
+
+    FIELDS = ['ghost', 'algorithm', 'searches', 'failures', 'expanded', 'pushed', 'peak_frontier',
+              'avg_expanded', 'avg_pushed', 'avg_path_length', 'total_ms', 'avg_ms']
+
+    def __init__(self):
+        self.totals = {}  # (ghost, algorithm) -> running sums
+
+    def wrap(self, algorithm, ghost, name=None):
+        """Path algorithm with the usual signature whose every call is recorded for ghost"""
+        if name is None:
+            name = getattr(algorithm, '__name__', type(algorithm).__name__)
+        with_stats = accepts_stats(algorithm)
+
+        def recorded_algorithm(level, start, end, visualize=False):
+            stats = {}
+            started = time.perf_counter()
+            if with_stats:
+                path = algorithm(level, start, end, visualize=visualize, stats=stats)
+            else:
+                path = algorithm(level, start, end, visualize=visualize)
+            stats.setdefault('seconds', time.perf_counter() - started)
+            stats.setdefault('path_length', len(path))
+            self.record(ghost, name, stats)
+            return path
+        return recorded_algorithm
+
+    def record(self, ghost, algorithm, stats):
+        """Add one stats record"""
+        totals = self.totals.get((ghost, algorithm))
+        if totals is None:
+            totals = {'searches': 0, 'failures': 0, 'path_length': 0, 'seconds': 0.0,
+                      'counted': 0, 'expanded': 0, 'pushed': 0, 'peak_frontier': 0}
+            self.totals[(ghost, algorithm)] = totals
+
+        totals['searches'] += 1
+        totals['path_length'] += stats['path_length']
+        totals['seconds'] += stats['seconds']
+        if not stats['path_length']:
+            totals['failures'] += 1
+        if 'expanded' in stats:
+            totals['counted'] += 1
+            totals['expanded'] += stats['expanded']
+            totals['pushed'] += stats['pushed']
+            totals['peak_frontier'] = max(totals['peak_frontier'], stats['peak_frontier'])
+
+    def reset(self):
+        self.totals.clear()
+
+    def rows(self):
+        """One summary dict per (ghost, algorithm), in FIELDS order"""
+        rows = []
+        for (ghost, algorithm), totals in sorted(self.totals.items(), key=lambda item: tuple(map(str, item[0]))):
+            searches, counted = totals['searches'], totals['counted']
+            rows.append({
+                'ghost': ghost,
+                'algorithm': algorithm,
+                'searches': searches,
+                'failures': totals['failures'],
+                'expanded': totals['expanded'] if counted else None,
+                'pushed': totals['pushed'] if counted else None,
+                'peak_frontier': totals['peak_frontier'] if counted else None,
+                'avg_expanded': round(totals['expanded'] / counted, 2) if counted else None,
+                'avg_pushed': round(totals['pushed'] / counted, 2) if counted else None,
+                'avg_path_length': round(totals['path_length'] / searches, 2),
+                'total_ms': round(totals['seconds'] * 1000, 3),
+                'avg_ms': round(totals['seconds'] * 1000 / searches, 4),
+            })
+        return rows
+
+    def export_csv(self, filename):
+        with open(filename, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+            writer.writeheader()
+            writer.writerows(self.rows())
@@ -0,0 +1,210 @@
+"""
+Time-sliced (anytime) pathfinding for the ghosts.
+
+A full search on a large generated level can take longer than a frame. SlicedSearch is
+an A* over a GridIndex that stops after a given number of tile expansions and carries
+on from the same frontier when run again. SlicedPlanner gives each ghost one of these
+with a fixed budget per call, so pathfinding costs at most that many expansions per
+ghost per frame however large the maze is.
+
+The search runs backwards, from the target towards the ghost, so every expanded tile's
+parent is its next step towards the target. A ghost reads its next tile straight off
+the search tree; no path is ever rebuilt, which would cost time in proportion to its
+length. The tree lives in flat arrays allocated once per level and reused by later
+searches: a generation stamp tells this search's tiles from stale ones, so nothing is
+cleared, and no dict ever has to grow (and copy itself) in the middle of a frame.
+"""
+import heapq
+import time
+from array import array
+from maze_solver.grid_search import grid_for
+from maze_solver.pathfinding_utils import check_endpoints
+from maze_solver.search_stats import finish_stats
+
+FRAME_BUDGET = 200  # Tile expansions per ghost per frame
+
+BACK = (1, 0, 3, 2)  # Index of the opposite of each GridIndex offset (up, down, right, left)
+
+
+class TreeBuffers:
+    """Search tree arrays for one level, reusable by any number of SlicedSearches in turn"""
+
+    def __init__(self, size):
+        self.parent = bytearray(size)  # Offset index from a tile to its parent
+        self.cost = array('i', [0]) * size  # Steps to the search's goal
+        self.marks = array('I', [0]) * size  # 2 * generation once seen, + 1 once expanded
+        self.generation = 0
+
+
+class SlicedSearch:
+    """
+    A* from goal towards aim on a GridIndex that can be run in slices. Expanded tiles
+    have exact distances to goal, whichever tile the heuristic aims at.
+    buffers (TreeBuffers of the grid's size) are taken over by this search.
+    """
+
+    def __init__(self, grid, goal, aim, buffers):
+        self.grid = grid
+        self.goal = goal
+        self.buffers = buffers
+        buffers.generation += 1
+        self.seen_mark = 2 * buffers.generation
+        self.closed_mark = self.seen_mark + 1
+
+        self.source = grid.index(*goal)
+        self.aim_column, self.aim_row = divmod(grid.index(*aim), grid.height)
+        buffers.marks[self.source] = self.seen_mark
+        buffers.cost[self.source] = 0
+        # Heap entries are ints, (f * span + h) * size + tile, so ties go to the tile nearer
+        # aim and a slice allocates nothing the garbage collector has to look at
+        self.span = grid.height + grid.size // grid.height  # Above any heuristic value
+        h = self.heuristic(self.source)
+        self.heap = [(h * self.span + h) * grid.size + self.source]
+        self.pushed = 1
+
+    def heuristic(self, index):
+        column, row = divmod(index, self.grid.height)
+        return abs(column - self.aim_column) + abs(row - self.aim_row)
+
+    def reached(self, tile):
+        """Whether tile's route to goal is known"""
+        return self.buffers.marks[self.grid.index(*tile)] == self.closed_mark
+
+    def exhausted(self):
+        """Whether every tile that can reach goal has been expanded"""
+        return not self.heap
+
+    def run(self, budget, until=None):
+        """
+        Expand at most budget tiles, stopping early once the tile until is expanded;
+        returns (expanded, pushed, peak frontier) of this slice
+        """
+        cells = self.grid.open
+        steps = tuple(zip(self.grid.offsets, BACK))
+        parent, cost, marks = self.buffers.parent, self.buffers.cost, self.buffers.marks
+        seen_mark, closed_mark = self.seen_mark, self.closed_mark
+        heap = self.heap
+        heuristic = self.heuristic
+        span, size = self.span, self.grid.size
+        # A border tile is never expanded, so without until only the budget stops the slice
+        stop = self.grid.index(*until) if until is not None else 0
+        pushed = self.pushed
+        expanded = 0
+        peak = len(heap)
+
+        while heap and expanded < budget and marks[stop] != closed_mark:
+            current = heapq.heappop(heap) % size
+            if marks[current] == closed_mark:
+                continue  # Stale entry for a tile reached again at a lower cost
+            marks[current] = closed_mark
+            expanded += 1
+            new_cost = cost[current] + 1
+            for offset, back in steps:
+                neighbor = current + offset
+                if cells[neighbor] and (marks[neighbor] < seen_mark or
+                                        (marks[neighbor] == seen_mark and new_cost < cost[neighbor])):
+                    marks[neighbor] = seen_mark
+                    cost[neighbor] = new_cost
+                    parent[neighbor] = back
+                    neighbor_h = heuristic(neighbor)
+                    heapq.heappush(heap, ((new_cost + neighbor_h) * span + neighbor_h) * size + neighbor)
+                    self.pushed += 1
+            if len(heap) > peak:
+                peak = len(heap)
+
+        return expanded, self.pushed - pushed, peak
+
+    def route(self, tile, steps=1):
+        """
+        tile followed by up to steps tiles of its shortest route to goal (the whole
+        route if steps is None); [] if the route is not known yet
+        """
+        current = self.grid.index(*tile)
+        if self.buffers.marks[current] != self.closed_mark:
+            return []
+        offsets, parent = self.grid.offsets, self.buffers.parent
+        route = [tuple(tile)]
+        while current != self.source and (steps is None or len(route) <= steps):
+            current += offsets[parent[current]]
+            route.append(self.grid.tile(current))
+        return route
+
+
+class SlicedPlanner:
+    """
+    Per-ghost A* that expands at most budget tiles per call and resumes where it left
+    off on the next one.
+
+    Call it like the other path functions: planner(level, start, end). Like the
+    distance field, it returns just [start, next tile] ([start] at the goal), since
+    ghosts replan every frame and only follow the first step.
+
+    A search is finished once it reaches the ghost's tile, and is then followed for
+    as long as the target stays put: the ghost keeps stepping onto tiles whose routes
+    are already known. While a newer search is unfinished the ghost follows the
+    previous one, if that reaches its tile; before the first search finishes it gets
+    [] and falls back to its ordinary chase movement.
+
+    A target that moves during a search does not restart it, or a search longer than
+    the target's stay on one tile would never finish; the next search aims at wherever
+    the target is by then.
+
+    Each ghost needs its own instance, and since results depend on earlier calls it
+    must not sit behind a PathCache. The state is reset when the level changes, which
+    is also when the two sets of tree buffers (the running search's and the one being
+    followed) are allocated.
+    """
+
+    def __init__(self, budget=FRAME_BUDGET):
+        self.budget = budget
+        self.level = None
+        self.version = None
+        self.grid = None
+        self.search = None  # Search still growing towards the ghost
+        self.settled = None  # Last search that reached the ghost
+        self.spare = []  # TreeBuffers not in use by either
+
+    def __call__(self, level, start, end, visualize=False, stats=None):
+        started = time.perf_counter()
+        if not check_endpoints(level, start, end):
+            return finish_stats(stats, [], started)
+
+        version = getattr(level, 'version', None)
+        if level is not self.level or version != self.version:
+            self.reset(level)
+
+        expanded = pushed = peak = 0
+        settled = self.settled
+        if self.search is None and not (settled is not None and settled.goal == end and settled.reached(start)):
+            self.search = SlicedSearch(self.grid, end, start, self.spare.pop())
+            pushed += 1
+
+        if self.search is not None:
+            expanded, slice_pushed, peak = self.search.run(self.budget, until=start)
+            pushed += slice_pushed
+            if self.search.reached(start):
+                self._release(self.settled)
+                self.settled, self.search = self.search, None
+            elif self.search.exhausted():  # start cannot reach the target
+                self._release(self.settled)
+                self._release(self.search)
+                self.settled = self.search = None
+
+        if stats is not None:
+            stats.update(expanded=expanded, pushed=pushed, peak_frontier=peak)
+
+        path = self.settled.route(start) if self.settled is not None else []
+        return finish_stats(stats, path, started)
+
+    def _release(self, search):
+        if search is not None:
+            self.spare.append(search.buffers)
+
+    def reset(self, level):
+        """Drop all search state, e.g. for a new level"""
+        self.level = level
+        self.version = getattr(level, 'version', None)
+        self.grid = grid_for(level)
+        self.search = None
+        self.settled = None
+        self.spare = [TreeBuffers(self.grid.size), TreeBuffers(self.grid.size)]
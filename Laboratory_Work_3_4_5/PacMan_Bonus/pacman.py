@@ -4,43 +4,67 @@ import pygame
 import math
 import copy
 import os
-from setup.level_loader import load_level
+import io
+import csv
+import time
+import random
+import argparse
+import functools
+import contextlib
+from setup.level_loader import load_level, open_ghost_box
 from setup.player_init import get_initial_positions
+from setup.pellet_index import PelletIndex
+from setup.level_info import LevelInfo
 from maze_maker.kruskal_algorithm import generate_and_save_tile_map
 from setup.config import WIDTH, HEIGHT
 from entities.player import Player
 from entities.ghost_base import Blinky, Pinky, Inky, Clyde
-from maze_solver.pathfinding_utils import bfs_path, dfs_path, dijkstra_path
-
-# Initialize pygame
-pygame.init()
+from entities.player_policies import RandomPolicy, ScriptedPolicy
+from entities.sprite_atlas import SpriteAtlas
+from board_renderer import BoardRenderer
+from maze_solver.pathfinding_utils import (bfs_path, bidirectional_bfs_path, dfs_path, dijkstra_path, astar_path,
+                                           weighted_dijkstra_path,
+                                           LandmarkHeuristic, DStarLitePlanner, PathCache)
+from maze_solver.level_graph import LevelGraph
+from maze_solver.next_hop_table import NextHopTable
+from maze_solver.jps import jps_path
+from maze_solver.distance_field import DistanceField
+from maze_solver.cost_map import CostMap
+from maze_solver.search_stats import SearchRecorder
+from maze_solver.sliced_search import SlicedPlanner, FRAME_BUDGET
 
 # Constants
-screen = pygame.display.set_mode([WIDTH, HEIGHT])
-pygame.display.set_caption("Pac-Man")
 timer = pygame.time.Clock()
 fps = 60
-font = pygame.font.Font('freesansbold.ttf', 20)
-title_font = pygame.font.Font('freesansbold.ttf', 30)
-color = 'blue'
-PI = math.pi
 
-# Load images
+# Display and images, created by init_display() and load_sprites().
+# A headless run never opens a window, so screen stays None.
+screen = None
+font = None
+title_font = None
 player_images = []
-for i in range(1, 5):
-    player_images.append(pygame.transform.scale(pygame.image.load(f'assets/player_images/{i}.png'), (45, 45)))
-
-blinky_img = pygame.transform.scale(pygame.image.load(f'assets/ghost_images/red.png'), (45, 45))
-pinky_img = pygame.transform.scale(pygame.image.load(f'assets/ghost_images/pink.png'), (45, 45))
-inky_img = pygame.transform.scale(pygame.image.load(f'assets/ghost_images/blue.png'), (45, 45))
-clyde_img = pygame.transform.scale(pygame.image.load(f'assets/ghost_images/orange.png'), (45, 45))
-spooked_img = pygame.transform.scale(pygame.image.load(f'assets/ghost_images/powerup.png'), (45, 45))
-dead_img = pygame.transform.scale(pygame.image.load(f'assets/ghost_images/dead.png'), (45, 45))
+blinky_img = pinky_img = inky_img = clyde_img = None
+spooked_img = dead_img = None
+player_atlas = None
+ghost_atlases = {}
+life_img = None
 
 # Game variables
 game_menu = True
 level_source = None
 level = None
+level_graph = None
+landmark_heuristic = None  # ALT landmarks, computed once per level for the 'astar_alt' ghosts
+distance_field = None
+path_cache = PathCache()  # Shared by all ghosts; empties itself when the level changes
+use_path_cache = True
+search_recorder = None  # SearchRecorder when --search-stats is given
+search_budget = FRAME_BUDGET  # Tile expansions per ghost per frame for the 'sliced' ghosts
+danger_map = None  # Tile costs for the weighted ('dial') ghosts
+danger_key = None  # What danger_map was last built from
+board_renderer = None
+pellet_index = None
+level_info = None
 player = None
 blinky = None
 inky = None
@@ -63,10 +87,111 @@ game_won = False
 ghost_movement = "original"  # Default to original movement
 path_alg = 'bfs'
 
+# Pathfinding algorithms offered in the menu: (path_alg value, button label)
+PATH_ALGORITHMS = [
+    ('bfs', 'BFS'),
+    ('bibfs', 'Bidirectional BFS'),
+    ('dfs', 'DFS'),
+    ('dijkstra', 'Dijkstra'),
+    ('astar', 'A*'),
+    ('astar_alt', 'A* Landmarks'),
+    ('jps', 'Jump Point'),
+    ('field', 'Distance Field'),
+    ('dial', 'Weighted (Dial)'),
+    ('dstar_lite', 'D* Lite'),
+    ('table', 'Next-Hop Table'),
+    ('sliced', 'Time-Sliced A*'),
+]
+
+
+# Extra tile costs for the weighted ('dial') ghosts
+TUNNEL_LENGTH = 5  # Tiles from each screen edge that count as tunnel
+TUNNEL_COST = 3
+POWERUP_DANGER_RADIUS = 5  # Tiles around a powered-up Pac-Man
+POWERUP_DANGER_COST = 8
+GHOST_TILE_COST = 4
+
+
+def algorithm_button_rect(index):
+    """Menu button area of the index-th entry in PATH_ALGORITHMS (three per row)"""
+    column, row = index % 3, index // 3
+    return pygame.Rect(WIDTH // 2 - 295 + column * 200, 670 + row * 45, 190, 36)
+
+
+def make_path_algorithm(name):
+    """Resolve a path_alg value; stateful planners get a fresh instance for every ghost
+    (the distance field and the landmark heuristic are the exception: they are per level)"""
+    if name == 'bibfs':
+        return bidirectional_bfs_path
+    elif name == 'dfs':
+        return dfs_path
+    elif name == 'dijkstra':
+        return dijkstra_path
+    elif name == 'astar':
+        return astar_path
+    elif name == 'astar_alt':
+        return functools.partial(astar_path, heuristic=landmark_heuristic)
+    elif name == 'jps':
+        return jps_path
+    elif name == 'field':
+        return distance_field  # Shared: one flood per target tile serves every ghost
+    elif name == 'dial':
+        return functools.partial(weighted_dijkstra_path, costs=danger_map)
+    elif name == 'dstar_lite':
+        return DStarLitePlanner()
+    elif name == 'sliced':
+        return SlicedPlanner(search_budget)
+    elif name == 'table' and level_source == 'original':
+        # Precomputed for the fixed board only; generated mazes fall back to BFS
+        return NextHopTable.load_or_build(level_graph)
+    return bfs_path  # fallback
+
+
+def init_display():
+    """Initialize pygame, open the game window and load fonts"""
+    global screen, font, title_font
+
+    pygame.init()
+    screen = pygame.display.set_mode([WIDTH, HEIGHT])
+    pygame.display.set_caption("Pac-Man")
+    font = pygame.font.Font('freesansbold.ttf', 20)
+    title_font = pygame.font.Font('freesansbold.ttf', 30)
+
+
+def load_sprites():
+    """Load player and ghost images and build their atlases (no window is needed for this)"""
+    global player_images, blinky_img, pinky_img, inky_img, clyde_img, spooked_img, dead_img
+    global player_atlas, ghost_atlases, life_img
+
+    player_images = []
+    for i in range(1, 5):
+        player_images.append(pygame.transform.scale(pygame.image.load(f'assets/player_images/{i}.png'), (45, 45)))
+
+    blinky_img = pygame.transform.scale(pygame.image.load(f'assets/ghost_images/red.png'), (45, 45))
+    pinky_img = pygame.transform.scale(pygame.image.load(f'assets/ghost_images/pink.png'), (45, 45))
+    inky_img = pygame.transform.scale(pygame.image.load(f'assets/ghost_images/blue.png'), (45, 45))
+    clyde_img = pygame.transform.scale(pygame.image.load(f'assets/ghost_images/orange.png'), (45, 45))
+    spooked_img = pygame.transform.scale(pygame.image.load(f'assets/ghost_images/powerup.png'), (45, 45))
+    dead_img = pygame.transform.scale(pygame.image.load(f'assets/ghost_images/dead.png'), (45, 45))
+
+    # Every rotation, flip and scale is done here once instead of on every frame
+    player_atlas = SpriteAtlas.for_player(player_images)
+    ghost_atlases = {
+        'blinky': SpriteAtlas.for_ghost(blinky_img, spooked_img, dead_img),
+        'inky': SpriteAtlas.for_ghost(inky_img, spooked_img, dead_img),
+        'pinky': SpriteAtlas.for_ghost(pinky_img, spooked_img, dead_img),
+        'clyde': SpriteAtlas.for_ghost(clyde_img, spooked_img, dead_img),
+    }
+    life_img = pygame.transform.scale(player_images[0], (30, 30))
+
+
 def initialize_game():
     """Initialize or reset the game state"""
     global player, blinky, inky, pinky, clyde, score, lives
-    global eaten_ghost, level, game_over, game_won, startup_counter, moving, power_counter, powerup
+    global eaten_ghost, level, level_graph, landmark_heuristic, distance_field, danger_map, danger_key
+    global level_info, board_renderer, pellet_index
+    global game_over, game_won, startup_counter, moving
+    global power_counter, powerup
 
     print(f"Initializing game with level_source={level_source}, ghost_movement={ghost_movement}")  # Debug print
 
@@ -83,38 +208,26 @@ def initialize_game():
         level = copy.deepcopy(boards)
         print("Using original level")
 
-        # Remove top of ghost box if present
-        center_x = len(level[0]) // 2
-        center_y = len(level) // 2
-        gate_found = False
-        for y in range(len(level)):
-            for x in range(len(level[0])):
-                if level[y][x] == 9:
-                    gate_y, gate_x = y, x
-                    gate_found = True
-                    for dy in range(-4, 2):
-                        ny = gate_y + dy
-                        if 0 <= ny < len(level):
-                            for dx in range(-1, 2):
-                                nx = gate_x + dx
-                                if 0 <= nx < len(level[0]):
-                                    level[ny][nx] = 0
-                    break
-            if gate_found:
-                break
-        if not gate_found:
-            gate_y = center_y - 2
-            for x in range(center_x - 3, center_x + 4):
-                if 0 <= x < len(level[0]):
-                    if level[gate_y][x] in [4, 5, 6, 9]:
-                        level[gate_y][x] = 0
+        open_ghost_box(level)
+
+    # Walls are fixed from here on, so one navigation graph serves every ghost
+    level_graph = LevelGraph(level)
+    landmark_heuristic = LandmarkHeuristic(level_graph) if path_alg == 'astar_alt' else None
+    distance_field = DistanceField()
+    danger_map = CostMap(level_graph)
+    danger_key = None
+    pellet_index = PelletIndex(level)
+    level_info = LevelInfo(level, level_source)
+
+    # Walls and pellets are pre-rendered once per level (not needed without a window)
+    board_renderer = BoardRenderer(level, level_source, pellet_index) if screen is not None else None
 
     # Get starting positions
     try:
         (start_x, start_y), ghost_starts = get_initial_positions(level_source, level)
         print(f"Player starting position: ({start_x}, {start_y})")
 
-        player = Player(start_x, start_y, 2, player_images)
+        player = Player(start_x, start_y, 2, player_images, atlas=player_atlas)
 
         # Set ghost positions
         blinky_x, blinky_y = ghost_starts["blinky"]
@@ -125,29 +238,30 @@ def initialize_game():
         print(f"Ghost positions - Blinky: ({blinky_x}, {blinky_y}), Inky: ({inky_x}, {inky_y}), "
               f"Pinky: ({pinky_x}, {pinky_y}), Clyde: ({clyde_x}, {clyde_y})")
 
-        # Resolve algorithm function
-        if path_alg == 'bfs':
-            algorithm_func = bfs_path
-        elif path_alg == 'dfs':
-            algorithm_func = dfs_path
-        elif path_alg == 'dijkstra':
-            algorithm_func = dijkstra_path
-        else:
-            algorithm_func = bfs_path  # fallback
-
         # Create ghost instances with algorithm assignment
         blinky = Blinky(blinky_x, blinky_y, 1, blinky_img, 0, 0, level, screen,
-                        lambda: powerup, lambda: eaten_ghost, lambda: level_source, lambda: ghost_movement)
+                        lambda: powerup, lambda: eaten_ghost, lambda: level_source, lambda: ghost_movement,
+                        sprites=ghost_atlases['blinky'])
         inky = Inky(inky_x, inky_y, 1, inky_img, 2, 1, level, screen,
-                    lambda: powerup, lambda: eaten_ghost, lambda: level_source, lambda: ghost_movement)
+                    lambda: powerup, lambda: eaten_ghost, lambda: level_source, lambda: ghost_movement,
+                    sprites=ghost_atlases['inky'])
         pinky = Pinky(pinky_x, pinky_y, 1, pinky_img, 2, 2, level, screen,
-                      lambda: powerup, lambda: eaten_ghost, lambda: level_source, lambda: ghost_movement)
+                      lambda: powerup, lambda: eaten_ghost, lambda: level_source, lambda: ghost_movement,
+                      sprites=ghost_atlases['pinky'])
         clyde = Clyde(clyde_x, clyde_y, 1, clyde_img, 2, 3, level, screen,
-                      lambda: powerup, lambda: eaten_ghost, lambda: level_source, lambda: ghost_movement)
+                      lambda: powerup, lambda: eaten_ghost, lambda: level_source, lambda: ghost_movement,
+                      sprites=ghost_atlases['clyde'])
 
-        # Assign algorithm function to all ghosts
+        # Assign algorithm function and shared level data to all ghosts
         for ghost in [blinky, inky, pinky, clyde]:
-            ghost.path_algorithm = algorithm_func
+            ghost.path_algorithm = make_path_algorithm(path_alg)
+            if search_recorder is not None:  # Inside the cache: only real searches are recorded
+                ghost.path_algorithm = search_recorder.wrap(ghost.path_algorithm, type(ghost).__name__, path_alg)
+            if use_path_cache and path_alg != 'sliced':  # Sliced answers depend on earlier calls
+                stamp = (lambda: danger_map.version) if path_alg == 'dial' else None
+                ghost.path_algorithm = path_cache.wrap(ghost.path_algorithm, path_alg, stamp)
+            ghost.level_graph = level_graph
+            ghost.level_info = level_info
 
         # Reset game state
         score = 0
@@ -188,77 +302,6 @@ def initialize_game():
         traceback.print_exc()
 
 
-def draw_board_original():
-    num1 = ((HEIGHT - 50) // 32)
-    num2 = (WIDTH // 30)
-
-    for i in range(len(level)):
-        for j in range(len(level[i])):
-            tile = level[i][j]
-
-            # Pellets
-            if tile == 1:
-                pygame.draw.circle(screen, 'white', (j * num2 + num2 // 2, i * num1 + num1 // 2), 4)
-            elif tile == 2 and not flicker:
-                pygame.draw.circle(screen, 'white', (j * num2 + num2 // 2, i * num1 + num1 // 2), 10)
-
-            # Walls (full classic style)
-            if tile == 3:  # Vertical
-                pygame.draw.line(screen, color, (j * num2 + num2 // 2, i * num1),
-                                 (j * num2 + num2 // 2, i * num1 + num1), 3)
-            elif tile == 4:  # Horizontal
-                pygame.draw.line(screen, color, (j * num2, i * num1 + num1 // 2),
-                                 (j * num2 + num2, i * num1 + num1 // 2), 3)
-            elif tile == 5:  # Top-right corner
-                pygame.draw.arc(screen, color,
-                                [(j * num2 - (num2 * 0.4)) - 2, (i * num1 + (0.5 * num1)), num2, num1],
-                                0, PI / 2, 3)
-            elif tile == 6:  # Top-left corner
-                pygame.draw.arc(screen, color,
-                                [(j * num2 + (num2 * 0.5)), (i * num1 + (0.5 * num1)), num2, num1],
-                                PI / 2, PI, 3)
-            elif tile == 7:  # Bottom-left corner
-                pygame.draw.arc(screen, color,
-                                [(j * num2 + (num2 * 0.5)), (i * num1 - (0.4 * num1)), num2, num1],
-                                PI, 3 * PI / 2, 3)
-            elif tile == 8:  # Bottom-right corner
-                pygame.draw.arc(screen, color,
-                                [(j * num2 - (num2 * 0.4)) - 2, (i * num1 - (0.4 * num1)), num2, num1],
-                                3 * PI / 2, 2 * PI, 3)
-            elif tile == 9:  # Gate
-                pygame.draw.line(screen, 'white',
-                                 (j * num2 + 5, i * num1 + num1 // 2),
-                                 (j * num2 + num2 - 5, i * num1 + num1 // 2), 2)
-
-
-def draw_board_generated():
-    """Draw the generated maze with polished solid blue walls and white pellets."""
-    tile_height = (HEIGHT - 50) // 32
-    tile_width = WIDTH // 30
-    PELLET_RADIUS = 3
-    POWER_RADIUS = 8
-
-    for i in range(len(level)):
-        for j in range(len(level[i])):
-            tile = level[i][j]
-            x = j * tile_width
-            y = i * tile_height
-
-            if tile == 4:
-                # Outer darker border
-                pygame.draw.rect(screen, (0, 0, 180), pygame.Rect(x, y, tile_width, tile_height))
-                # Inner brighter fill
-                pygame.draw.rect(screen, (0, 0, 255), pygame.Rect(x + 2, y + 2, tile_width - 4, tile_height - 4))
-
-            elif tile == 1:
-                pygame.draw.circle(screen, 'white',
-                                   (x + tile_width // 2, y + tile_height // 2), PELLET_RADIUS)
-
-            elif tile == 2 and not flicker:
-                pygame.draw.circle(screen, 'white',
-                                   (x + tile_width // 2, y + tile_height // 2), POWER_RADIUS)
-
-
 def draw_misc():
     """Draw score, lives, power indicator, and game state messages"""
     # Score
@@ -271,10 +314,11 @@ def draw_misc():
 
     # Lives
     for i in range(lives):
-        screen.blit(pygame.transform.scale(player_images[0], (30, 30)), (650 + i * 40, 915))
+        screen.blit(life_img, (650 + i * 40, 915))
 
     # Game over
     if game_over:
+        board_renderer.add_dirty([50, 200, 800, 300])
         pygame.draw.rect(screen, 'white', [50, 200, 800, 300], 0, 10)
         pygame.draw.rect(screen, 'dark gray', [70, 220, 760, 260], 0, 10)
         gameover_text = font.render('Game over! Space bar to restart!', True, 'red')
@@ -282,6 +326,7 @@ def draw_misc():
 
     # Victory
     if game_won:
+        board_renderer.add_dirty([50, 200, 800, 300])
         pygame.draw.rect(screen, 'white', [50, 200, 800, 300], 0, 10)
         pygame.draw.rect(screen, 'dark gray', [70, 220, 760, 260], 0, 10)
         gameover_text = font.render('Victory! Space bar to restart!', True, 'green')
@@ -334,23 +379,13 @@ def draw_menu():
         alg_text = font.render('Pathfinding Algorithm:', True, 'white')
         screen.blit(alg_text, (WIDTH // 2 - alg_text.get_width() // 2, 630))
 
-        # BFS button - position [WIDTH // 2 - 150, 670, 300, 40]
-        pygame.draw.rect(screen, 'blue' if path_alg == 'bfs' else 'white',
-                         [WIDTH // 2 - 150, 670, 300, 40], 0 if path_alg == 'bfs' else 2, 10)
-        bfs_text = font.render('BFS', True, 'white' if path_alg == 'bfs' else 'blue')
-        screen.blit(bfs_text, (WIDTH // 2 - bfs_text.get_width() // 2, 680))
-
-        # DFS button - position [WIDTH // 2 - 150, 720, 300, 40]
-        pygame.draw.rect(screen, 'blue' if path_alg == 'dfs' else 'white',
-                         [WIDTH // 2 - 150, 720, 300, 40], 0 if path_alg == 'dfs' else 2, 10)
-        dfs_text = font.render('DFS', True, 'white' if path_alg == 'dfs' else 'blue')
-        screen.blit(dfs_text, (WIDTH // 2 - dfs_text.get_width() // 2, 730))
-
-        # Dijkstra button - position [WIDTH // 2 - 150, 770, 300, 40]
-        pygame.draw.rect(screen, 'blue' if path_alg == 'dijkstra' else 'white',
-                         [WIDTH // 2 - 150, 770, 300, 40], 0 if path_alg == 'dijkstra' else 2, 10)
-        dijkstra_text = font.render('Dijkstra', True, 'white' if path_alg == 'dijkstra' else 'blue')
-        screen.blit(dijkstra_text, (WIDTH // 2 - dijkstra_text.get_width() // 2, 780))
+        for index, (name, label) in enumerate(PATH_ALGORITHMS):
+            rect = algorithm_button_rect(index)
+            pygame.draw.rect(screen, 'blue' if path_alg == name else 'white',
+                             rect, 0 if path_alg == name else 2, 10)
+            alg_label = font.render(label, True, 'white' if path_alg == name else 'blue')
+            screen.blit(alg_label, (rect.centerx - alg_label.get_width() // 2,
+                                    rect.centery - alg_label.get_height() // 2))
 
     # Start button - position [WIDTH // 2 - 100, 850, 200, 60]
     if level_source is not None:
@@ -410,18 +445,19 @@ def check_pellet_collisions():
         tile_x = int(player.center_x // num2)
         tile_y = int(player.center_y // num1)
 
-        # Ensure we don't try to access out of bounds
-        if 0 <= tile_y < len(level) and 0 <= tile_x < len(level[0]):
-            current_tile = level[tile_y][tile_x]
+        # The pellet index answers in O(1) and ignores out-of-bounds tiles
+        eaten = pellet_index.eat(tile_x, tile_y)
+        if eaten:
+            level[tile_y][tile_x] = 0
+            if board_renderer:
+                board_renderer.erase_pellet(tile_x, tile_y)
 
             # Check for regular pellet
-            if current_tile == 1:
-                level[tile_y][tile_x] = 0
+            if eaten == 1:
                 score += 10
 
             # Check for power pellet - use elif to avoid double processing
-            elif current_tile == 2:
-                level[tile_y][tile_x] = 0
+            elif eaten == 2:
                 score += 50
                 powerup = True
                 power_counter = 0
@@ -488,7 +524,7 @@ def reset_player_and_ghosts():
 def check_win_condition():
     """Check if player has won by eating all pellets"""
     # If no pellets (1) or power pellets (2) remain, player wins
-    return not any(1 in row or 2 in row for row in level)
+    return pellet_index.is_cleared()
 
 
 def handle_menu_events(event):
@@ -504,9 +540,6 @@ def handle_menu_events(event):
         generated_maze_btn = pygame.Rect(WIDTH // 2 - 150, 370, 300, 50)
         original_behavior_btn = pygame.Rect(WIDTH // 2 - 150, 500, 300, 50)
         pathfinding_behavior_btn = pygame.Rect(WIDTH // 2 - 150, 570, 300, 50)
-        bfs_btn = pygame.Rect(WIDTH // 2 - 150, 670, 300, 40)
-        dfs_btn = pygame.Rect(WIDTH // 2 - 150, 720, 300, 40)
-        dijkstra_btn = pygame.Rect(WIDTH // 2 - 150, 770, 300, 40)
         start_game_btn = pygame.Rect(WIDTH // 2 - 100, 850, 200, 60)
 
         # Check start game button FIRST before all other checks
@@ -536,17 +569,11 @@ def handle_menu_events(event):
 
         # Only check algorithm buttons if pathfinding is selected
         elif ghost_movement == 'pathfinding':
-            if bfs_btn.collidepoint(mouse_pos):
-                path_alg = 'bfs'
-                print(f"Selected: BFS. path_alg={path_alg}")
-
-            elif dfs_btn.collidepoint(mouse_pos):
-                path_alg = 'dfs'
-                print(f"Selected: DFS. path_alg={path_alg}")
-
-            elif dijkstra_btn.collidepoint(mouse_pos):
-                path_alg = 'dijkstra'
-                print(f"Selected: Dijkstra. path_alg={path_alg}")
+            for index, (name, label) in enumerate(PATH_ALGORITHMS):
+                if algorithm_button_rect(index).collidepoint(mouse_pos):
+                    path_alg = name
+                    print(f"Selected: {label}. path_alg={path_alg}")
+                    break
 
         # Print current state after any click
         print(f"Current state: level_source={level_source}, ghost_movement={ghost_movement}, game_menu={game_menu}")
@@ -571,6 +598,9 @@ def handle_game_events(event):
         elif event.key == pygame.K_ESCAPE:
             game_menu = True  # Return to menu
 
+    elif event.type == pygame.VIDEOEXPOSE:
+        board_renderer.request_full_redraw()  # Window contents were lost
+
     elif event.type == pygame.KEYUP:
         if event.key == pygame.K_RIGHT and player.command == 0:
             player.command = player.direction
@@ -641,28 +671,56 @@ def update_ghost_speeds():
 
 
 def draw_game_elements():
+    """Draw the board, sprites and HUD; returns the screen rectangles that changed"""
     global game_won
 
-    screen.fill('black')
-
-    # Use appropriate draw function
-    if level_source == 'original':
-        draw_board_original()
-    elif level_source == 'generated':
-        draw_board_generated()
+    # Walls and pellets come from the pre-rendered layers
+    board_renderer.begin_frame(screen, flicker)
 
     game_won = check_win_condition()
 
     pygame.draw.circle(screen, 'black', (player.center_x, player.center_y), 20, 2)
     player.draw(screen)
+    board_renderer.add_dirty(pygame.Rect(player.x, player.y, 45, 45).inflate(10, 10))
 
-    if blinky: blinky.rect = blinky.draw()
-    if inky: inky.rect = inky.draw()
-    if pinky: pinky.rect = pinky.draw()
-    if clyde: clyde.rect = clyde.draw()
+    # Inflated so the pathfinding marker drawn during movement is covered too
+    for ghost in [blinky, inky, pinky, clyde]:
+        if ghost:
+            ghost.rect = ghost.draw()
+            board_renderer.add_dirty(ghost.rect.inflate(10, 10))
 
     draw_misc()
 
+    return board_renderer.end_frame()
+
+
+def update_danger_map():
+    """
+    Rebuild the weighted ghosts' tile costs when Pac-Man, the powerup or a ghost has
+    changed since last time: tunnels always cost extra, the area around Pac-Man does
+    while he is powered up, and so do tiles other ghosts stand on.
+    """
+    global danger_key
+
+    num1 = (HEIGHT - 50) // 32
+    num2 = WIDTH // 30
+    pacman_tile = (player.center_x // num2, player.center_y // num1)
+    ghost_tiles = tuple((int(ghost.center_x // num2), int(ghost.center_y // num1))
+                        for ghost in [blinky, inky, pinky, clyde] if ghost)
+    key = (pacman_tile, powerup, ghost_tiles)
+    if key == danger_key:
+        return
+    danger_key = key
+
+    danger_map.reset()
+    cols = len(level[0])
+    for y in level_info.tunnel_rows:
+        for x in list(range(TUNNEL_LENGTH)) + list(range(cols - TUNNEL_LENGTH, cols)):
+            danger_map.add(x, y, TUNNEL_COST)
+    if powerup:
+        danger_map.add_area(pacman_tile[0], pacman_tile[1], POWERUP_DANGER_RADIUS, POWERUP_DANGER_COST)
+    for x, y in ghost_tiles:
+        danger_map.add(x, y, GHOST_TILE_COST)
 
 
 def process_movement(turns_allowed):
@@ -676,6 +734,10 @@ def process_movement(turns_allowed):
     # Update ghost states and speeds
     update_ghost_speeds()
 
+    # Weighted ghosts plan against the current danger map
+    if path_alg == 'dial' and ghost_movement == 'pathfinding':
+        update_danger_map()
+
     # Get targets for ghosts
     targets = get_targets()
 
@@ -724,6 +786,9 @@ def main():
     global game_won, game_over, score
     global level_source, ghost_movement, game_menu, eaten_ghost
 
+    init_display()
+    load_sprites()
+
     # Default selection
     level_source = 'original'
     ghost_movement = 'original'
@@ -734,6 +799,7 @@ def main():
     run = True
     while run:
         timer.tick(fps)
+        dirty_rects = None
 
         # Update animation counter (used for pellet flicker)
         update_animation_counter()
@@ -757,7 +823,7 @@ def main():
             handle_startup_sequence()
 
             # Draw all game elements
-            draw_game_elements()
+            dirty_rects = draw_game_elements()
 
             # Process movement if game is active
             if moving:
@@ -767,12 +833,152 @@ def main():
             process_collisions()
             handle_screen_wraparound()
 
-        # Update display
-        pygame.display.flip()
+        # Update display: only the changed areas during play, everything in the menu
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
 
     # Quit pygame
     pygame.quit()
 
 
+def simulate_frame(turns_allowed):
+    """Advance the game by one frame without drawing, in the same order as main()"""
+    global game_won
+
+    update_animation_counter()
+    player.update_counter()
+    update_powerup_timer()
+    handle_startup_sequence()
+
+    # draw_game_elements() normally does these two
+    game_won = check_win_condition()
+    for ghost in [blinky, inky, pinky, clyde]:
+        if ghost:
+            ghost.rect = ghost.get_rect()
+
+    if moving:
+        turns_allowed = process_movement(turns_allowed)
+
+    process_collisions()
+    handle_screen_wraparound()
+    return turns_allowed
+
+
+# Columns of the per-game results returned by run_headless (and of --output)
+HEADLESS_FIELDS = ['game', 'level', 'movement', 'algorithm', 'won', 'lost', 'score', 'lives', 'frames']
+
+
+def run_headless(games, level_choice='original', movement='pathfinding', algorithm='bfs',
+                 policy=None, max_frames=20000, seed=None, verbose=False):
+    """
+    Play games with no window and no frame cap, as fast as the CPU allows.
+
+    The player is driven by policy(frame, player, turns), which returns a new command
+    or None (RandomPolicy by default). A game ends when it is won, lost, or after
+    max_frames frames. Returns one result dict per game.
+    """
+    global level_source, ghost_movement, path_alg, game_menu
+
+    if seed is not None:
+        random.seed(seed)
+    if policy is None:
+        policy = RandomPolicy(seed)
+
+    load_sprites()
+    level_source, ghost_movement, path_alg = level_choice, movement, algorithm
+    game_menu = False
+
+    # initialize_game and the pathfinders print a lot; keep it unless asked for
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+    results = []
+    for game in range(games):
+        with quiet:
+            initialize_game()
+
+            turns_allowed = [False, False, False, False]
+            frame = 0
+            while frame < max_frames and not (game_over or game_won):
+                command = policy(frame, player, turns_allowed)
+                if command is not None:
+                    player.command = command
+                turns_allowed = simulate_frame(turns_allowed)
+                frame += 1
+
+        results.append({
+            'game': game,
+            'level': level_source,
+            'movement': ghost_movement,
+            'algorithm': path_alg,
+            'won': game_won,
+            'lost': game_over,
+            'score': score,
+            'lives': lives,
+            'frames': frame,
+        })
+    return results
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Pac-Man with classic or pathfinding ghosts")
+    parser.add_argument("--headless", action="store_true",
+                        help="Simulate games without a window and without the FPS cap")
+    parser.add_argument("--games", type=int, default=100, help="Number of headless games")
+    parser.add_argument("--level", choices=["original", "generated"], default="original")
+    parser.add_argument("--movement", choices=["original", "pathfinding"], default="pathfinding")
+    parser.add_argument("--algorithm", choices=[name for name, _ in PATH_ALGORITHMS], default="bfs")
+    parser.add_argument("--script", default=None,
+                        help="Scripted player input like '0:R,200:U,350:L' instead of the random policy")
+    parser.add_argument("--max-frames", type=int, default=20000, help="Frame limit per headless game")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+    parser.add_argument("--output", default=None, help="CSV file for per-game headless results")
+    parser.add_argument("--verbose", action="store_true", help="Keep game and pathfinding prints")
+    parser.add_argument("--no-path-cache", action="store_true", help="Search every ghost path query again")
+    parser.add_argument("--search-stats", default=None,
+                        help="CSV file for ghost search work per ghost and algorithm over the session")
+    parser.add_argument("--search-budget", type=int, default=FRAME_BUDGET,
+                        help="Tile expansions per ghost per frame for the 'sliced' algorithm")
+
+    args = parser.parse_args()
+    use_path_cache = not args.no_path_cache
+    search_budget = args.search_budget
+    if args.search_stats:
+        search_recorder = SearchRecorder()
+    if not args.headless:
+        main()
+    else:
+        policy = ScriptedPolicy.parse(args.script) if args.script else RandomPolicy(args.seed)
+
+        start_time = time.perf_counter()
+        results = run_headless(args.games, args.level, args.movement, args.algorithm,
+                               policy, args.max_frames, args.seed, args.verbose)
+        elapsed = time.perf_counter() - start_time
+
+        total_frames = sum(r['frames'] for r in results)
+        wins = sum(r['won'] for r in results)
+        print(f"{len(results)} games, {wins} won, average score "
+              f"{sum(r['score'] for r in results) / max(len(results), 1):.1f}")
+        print(f"{elapsed:.2f}s, {total_frames / max(elapsed, 1e-9):.0f} frames/s, "
+              f"{len(results) / max(elapsed, 1e-9) * 3600:.0f} games/hour")
+        if use_path_cache and args.movement == 'pathfinding' and args.algorithm != 'sliced':
+            stats = path_cache.stats()
+            print(f"Path cache: {stats['hits']} hits, {stats['misses']} misses, "
+                  f"{stats['evictions']} evictions, hit rate {stats['hit_rate']:.1%}")
+        if search_recorder is not None:
+            for row in search_recorder.rows():
+                expanded = 'n/a' if row['avg_expanded'] is None else row['avg_expanded']  # No work counters
+                print(f"{row['ghost']:<7}{row['algorithm']:<11}{row['searches']:>8} searches, "
+                      f"{expanded} expanded, {row['avg_path_length']} tiles, {row['avg_ms']} ms on average")
+
+        if args.output:
+            with open(args.output, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=HEADLESS_FIELDS)
+                writer.writeheader()
+                writer.writerows(results)
+            print(f"Results saved to {args.output}")
+
+    if search_recorder is not None:
+        search_recorder.export_csv(args.search_stats)
+        print(f"Search stats saved to {args.search_stats}")
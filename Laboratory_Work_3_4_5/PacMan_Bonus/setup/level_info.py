@@ -0,0 +1,69 @@
+from setup.config import WIDTH, HEIGHT, TILE_WIDTH, TILE_HEIGHT
+from maze_solver.flow_field import FlowField
+
+# Ghost box area and entry point in screen coordinates
+GHOST_BOX = {
+    'left': 380,
+    'right': 500,
+    'top': 370,
+    'bottom': 480,
+    'entry_x': 440,
+    'entry_y': 370
+}
+
+
+class LevelInfo:
+    """
+    Fixed landmarks of a level: gate tile, ghost box bounds, tunnel rows, the tiles a
+    ghost can respawn on and the flow field eaten ghosts follow back to the box.
+
+    Computed once per level in initialize_game so that ghosts read these values instead
+    of scanning the whole grid every frame.
+    """
+
+    def __init__(self, level, level_source):
+        self.level_source = level_source
+        self.rows = len(level)
+        self.cols = len(level[0]) if self.rows > 0 else 0
+
+        # First gate tile (9) in row-major order, or None if the level has no gate
+        self.gate = next(((x, y) for y, row in enumerate(level) for x, cell in enumerate(row) if cell == 9),
+                         None)
+
+        self.box = dict(GHOST_BOX)
+
+        # Original level: direction home from every tile, towards the middle of the box
+        self.home_tile = None
+        self.home_flow = None
+        if level_source == 'original':
+            self.home_tile = ((self.box['left'] + self.box['right']) // 2 // TILE_WIDTH,
+                              (self.box['top'] + self.box['bottom']) // 2 // TILE_HEIGHT)
+            self.home_flow = FlowField(level, [self.home_tile])
+
+        # Rows open at both screen edges, where actors wrap around
+        self.tunnel_rows = [y for y, row in enumerate(level) if row[0] <= 2 and row[-1] <= 2]
+
+        # Screen positions of path tiles near the centre, used to respawn eaten ghosts
+        # in generated levels (which have no ghost box)
+        center_x = WIDTH // 2
+        center_y = HEIGHT // 2
+        self.respawn_positions = []
+        for y, row in enumerate(level):
+            for x, cell in enumerate(row):
+                if cell == 1 or cell == 0:  # Path or empty space
+                    screen_x = x * TILE_WIDTH
+                    screen_y = y * TILE_HEIGHT
+                    if abs(screen_x - center_x) < 100 and abs(screen_y - center_y) < 100:
+                        self.respawn_positions.append((screen_x, screen_y))
+
+    def gate_center_x(self):
+        """Screen x of the gate's centre, or None without a gate"""
+        if self.gate is None:
+            return None
+        return self.gate[0] * TILE_WIDTH + TILE_WIDTH // 2
+
+    def gate_top(self):
+        """Screen y of the gate tile's top edge, or None without a gate"""
+        if self.gate is None:
+            return None
+        return self.gate[1] * TILE_HEIGHT
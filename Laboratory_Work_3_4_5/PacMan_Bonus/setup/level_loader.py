@@ -14,3 +14,32 @@ def load_level():
         level_source = 'original'
         level = copy.deepcopy(boards)
     return level_source, level
+
+
+def open_ghost_box(level):
+    """Remove the top of the ghost box (around the gate) from the original level, in place"""
+    center_x = len(level[0]) // 2
+    center_y = len(level) // 2
+    gate_found = False
+    for y in range(len(level)):
+        for x in range(len(level[0])):
+            if level[y][x] == 9:
+                gate_y, gate_x = y, x
+                gate_found = True
+                for dy in range(-4, 2):
+                    ny = gate_y + dy
+                    if 0 <= ny < len(level):
+                        for dx in range(-1, 2):
+                            nx = gate_x + dx
+                            if 0 <= nx < len(level[0]):
+                                level[ny][nx] = 0
+                break
+        if gate_found:
+            break
+    if not gate_found:
+        gate_y = center_y - 2
+        for x in range(center_x - 3, center_x + 4):
+            if 0 <= x < len(level[0]):
+                if level[gate_y][x] in [4, 5, 6, 9]:
+                    level[gate_y][x] = 0
+    return level
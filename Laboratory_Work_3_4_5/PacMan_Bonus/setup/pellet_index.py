@@ -0,0 +1,47 @@
+class PelletIndex:
+    """
+    Pellet and power pellet tiles of a level, with a count of what is left.
+
+    Built once when the level is loaded; eat() keeps it up to date in O(1), so the
+    win check never has to scan the level.
+    """
+
+    def __init__(self, level):
+        self.pellets = set()  # (x, y) tiles with a regular pellet (1)
+        self.power_pellets = set()  # (x, y) tiles with a power pellet (2)
+
+        for y, row in enumerate(level):
+            for x, tile in enumerate(row):
+                if tile == 1:
+                    self.pellets.add((x, y))
+                elif tile == 2:
+                    self.power_pellets.add((x, y))
+
+        self.remaining = len(self.pellets) + len(self.power_pellets)
+
+    def __len__(self):
+        return self.remaining
+
+    def __contains__(self, tile):
+        return tile in self.pellets or tile in self.power_pellets
+
+    def eat(self, x, y):
+        """Remove the pellet at (x, y); returns its tile code (1 or 2), or 0 if there was none"""
+        tile = (x, y)
+        if tile in self.pellets:
+            self.pellets.remove(tile)
+            self.remaining -= 1
+            return 1
+        if tile in self.power_pellets:
+            self.power_pellets.remove(tile)
+            self.remaining -= 1
+            return 2
+        return 0
+
+    def is_cleared(self):
+        return self.remaining == 0
+
+    def nearest(self, x, y, include_power=True):
+        """Closest remaining pellet to (x, y) by Manhattan distance, or None if there is none"""
+        candidates = self.pellets | self.power_pellets if include_power else self.pellets
+        return min(candidates, key=lambda tile: abs(tile[0] - x) + abs(tile[1] - y), default=None)